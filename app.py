@@ -1,18 +1,42 @@
 import os
 import re
 import json
+import threading
 import datetime as dt
-from io import BytesIO
-from urllib.parse import urljoin
+from collections import OrderedDict
 
 import pandas as pd
-import pdfplumber
-import requests
 import streamlit as st
-from bs4 import BeautifulSoup
 
 from modules.ui import render_global_ui, init_mobile_detection
-from modules.calendar_tab import render_calendar
+from modules.calendar_pdf import (
+    MONTHS,
+    PARSER_VERSION,
+    CalendarColumns,
+    iter_calendar_frames,
+    parse_calendar_columns,
+)
+from modules.calendar_links import extract_calendar_pdf_links
+from modules.calendar_cache import (
+    DownloadRef,
+    conditional_download,
+    conditional_get,
+    has_cached_frame,
+    load_cached_frame,
+    load_local_memo,
+    probe_urls,
+    store_cached_frame,
+    store_local_memo,
+)
+from modules.calendar_index import CalendarMetrics, CalendarQuery, build_calendar_metrics
+from modules.calendar_tab import (
+    LOCAL_RESOLVER_VERSION,
+    TEXT_DTYPE,
+    add_local_columns,
+    clean_text_col,
+    normalize_calendar_dates,
+    render_calendar,
+)
 from modules.tournaments_tab import render_tournaments
 from modules.points_tab import render_points
 from modules.rankings_tab import render_rankings
@@ -36,11 +60,9 @@ is_mobile = init_mobile_detection()
 # CONSTANTS
 # -------------------------------------------------
 HOME_URL = "https://fppadel.pt/"
-MONTHS = [
-    "JANEIRO", "FEVEREIRO", "MARÇO", "ABRIL", "MAIO", "JUNHO",
-    "JULHO", "AGOSTO", "SETEMBRO", "OUTUBRO", "NOVEMBRO", "DEZEMBRO",
-]
-MONTH_TO_NUM = {m.title(): i for i, m in enumerate(MONTHS, start=1)}
+
+# HEAD a todos os candidatos antes de escolher o PDF (FPPADEL_DISCOVERY_PROBE=0 desliga)
+DISCOVERY_PROBE = os.environ.get("FPPADEL_DISCOVERY_PROBE", "1") != "0"
 
 
 # -------------------------------------------------
@@ -53,46 +75,39 @@ def month_sort_key(m: str) -> int:
         return 999
 
 
-def _pick_highest_version(urls: list[str]) -> str:
-    def score(u: str) -> int:
-        m = re.search(r"-(\d+)\.pdf$", u)
-        return int(m.group(1)) if m else -1
+def _version_score(u: str) -> int:
+    m = re.search(r"-(\d+)\.pdf$", u)
+    return int(m.group(1)) if m else -1
 
+
+def _pick_highest_version(urls: list[str]) -> str:
     urls = list(set(urls))
-    urls.sort(key=lambda u: (score(u), u), reverse=True)
+    urls.sort(key=lambda u: (_version_score(u), u), reverse=True)
     return urls[0]
 
 
-def infer_year_from_pdf_url(pdf_url: str) -> int:
-    m = re.search(r"/uploads/(\d{4})/", pdf_url)
-    if m:
-        return int(m.group(1))
-    return dt.date.today().year
-
+def _pick_probed_candidate(urls: list[str]) -> str:
+    """Escolhe o candidato por HEAD: Last-Modified mais recente, depois sufixo -N e tamanho.
 
-def parse_day_range_to_dates(day_text: str, month_num: int, year: int):
-    """Converte 'Dia' do PDF (ex: '3-5', '3 a 5', '3/5', '3') em (data_inicio, data_fim)."""
-    day_text = (day_text or "").strip().lower()
-    nums = [int(n) for n in re.findall(r"\d{1,2}", day_text)]
-    if not nums:
-        return None, None
-
-    d1 = min(nums)
-    d2 = max(nums)
+    Links mortos (4xx/5xx) são descartados; se nenhum HEAD responder, cai para o sufixo -N.
+    """
+    probes = probe_urls(urls)
+    alive = [u for u in set(urls) if probes.get(u, {}).get("ok")]
+    if not alive:
+        return _pick_highest_version(urls)
 
-    def safe_date(d: int):
-        try:
-            return dt.date(year, month_num, d)
-        except Exception:
-            return None
+    def rank(u: str):
+        p = probes[u]
+        return (p.get("last_modified_ts") or 0, _version_score(u), p.get("content_length") or 0, u)
 
-    start = safe_date(d1)
-    end = safe_date(d2)
+    return max(alive, key=rank)
 
-    if start and end and end < start:
-        end = start
 
-    return start, end
+def infer_year_from_pdf_url(pdf_url: str) -> int:
+    m = re.search(r"/uploads/(\d{4})/", pdf_url)
+    if m:
+        return int(m.group(1))
+    return dt.date.today().year
 
 
 # -------------------------------------------------
@@ -101,23 +116,12 @@ def parse_day_range_to_dates(day_text: str, month_num: int, year: int):
 @st.cache_data(ttl=86400)
 def find_latest_calendar_pdf_url() -> str:
     try:
-        html = requests.get(HOME_URL, timeout=20).text
-        soup = BeautifulSoup(html, "html.parser")
-        candidates: list[str] = []
-
-        for a in soup.find_all("a", href=True):
-            href = a["href"].strip()
-            text = (a.get_text() or "").strip().lower()
-            if "saber mais" in text and href.lower().endswith(".pdf") and "calend" in href.lower():
-                candidates.append(urljoin(HOME_URL, href))
-
-        if not candidates:
-            for a in soup.find_all("a", href=True):
-                href = a["href"].strip()
-                if href.lower().endswith(".pdf") and "calend" in href.lower():
-                    candidates.append(urljoin(HOME_URL, href))
+        html = conditional_get(HOME_URL, timeout=20).decode("utf-8", errors="replace")
+        candidates = extract_calendar_pdf_links(html, HOME_URL)
 
         if candidates:
+            if DISCOVERY_PROBE:
+                return _pick_probed_candidate(candidates)
             return _pick_highest_version(candidates)
     except Exception:
         pass
@@ -126,311 +130,191 @@ def find_latest_calendar_pdf_url() -> str:
 
 
 @st.cache_data(ttl=86400)
-def download_pdf_bytes(pdf_url: str) -> bytes:
-    r = requests.get(pdf_url, timeout=30)
-    r.raise_for_status()
-    return r.content
+def download_pdf_file(pdf_url: str) -> DownloadRef:
+    """PDF descarregado em streaming para a cache em disco: (url, sha256, caminho)."""
+    return conditional_download(pdf_url, timeout=30)
 
 
 # -------------------------------------------------
 # PARSER (LOCAL/ORGANIZAÇÃO por coordenadas)
 # -------------------------------------------------
+def normalize_calendar_text(df: pd.DataFrame) -> pd.DataFrame:
+    """Limpa o texto (espaços colapsados, sem pontas, "" -> NA) de todas as colunas de texto.
+
+    Os repetidos já foram removidos no parse (CalendarColumns, a única etapa de dedupe).
+    """
+    if df is None or df.empty:
+        return df
+
+    out = df.copy()
+    for col in out.columns:
+        if out[col].dtype == object or pd.api.types.is_string_dtype(out[col].dtype):
+            out[col] = clean_text_col(out[col]).replace({"": pd.NA})
+
+    return out
+
+
+# O frame em disco já leva 'Local'/'Mapa' e as datas finais: muda com o parser,
+# com as regras de locais e com a normalização de datas (sufixo -d).
+FRAME_VERSION = f"{PARSER_VERSION}-l{LOCAL_RESOLVER_VERSION}-d1"
+
+
 @st.cache_data(ttl=86400)
-def parse_calendar_pdf(pdf_bytes: bytes, year: int) -> pd.DataFrame:
-    def looks_like_money(tok: str) -> bool:
-        return bool(re.fullmatch(r"[´']?\d{1,3}(?:\.\d{3})*(?:,\d+)?", tok))
-
-    def is_category_token(tok: str) -> bool:
-        return bool(re.fullmatch(r"(F|M|S)\d{1,2}", tok)) or tok in {"VET", "FIP"}
-
-    def group_words_into_rows(words, y_tol=3):
-        rows = []
-        for w in sorted(words, key=lambda x: (x["top"], x["x0"])):
-            placed = False
-            for r in rows:
-                if abs(w["top"] - r["y"]) <= y_tol:
-                    r["words"].append(w)
-                    r["y"] = (r["y"] * (len(r["words"]) - 1) + w["top"]) / len(r["words"])
-                    placed = True
-                    break
-            if not placed:
-                rows.append({"y": w["top"], "words": [w]})
-        for r in rows:
-            r["words"] = sorted(r["words"], key=lambda x: x["x0"])
-        return rows
-
-    rows_out = []
-    current_month = None
-
-    with pdfplumber.open(BytesIO(pdf_bytes)) as pdf:
-        for page in pdf.pages:
-            words = page.extract_words(use_text_flow=True) or []
-            if not words:
-                continue
-
-            line_rows = group_words_into_rows(words, y_tol=3)
-
-            x_local = None
-            x_org = None
-            for lr in line_rows:
-                line_text = " ".join(w["text"] for w in lr["words"]).strip()
-                up = line_text.upper()
-                if ("LOCAL" in up) and ("ORGAN" in up) and ("DIV" in up) and ("ACTIV" in up):
-                    for w in lr["words"]:
-                        t = w["text"].upper()
-                        if t == "LOCAL":
-                            x_local = w["x0"]
-                        if t.startswith("ORGAN"):
-                            x_org = w["x0"]
-
-            for lr in line_rows:
-                line_text = " ".join(w["text"] for w in lr["words"]).strip()
-                if not line_text:
-                    continue
-
-                up = line_text.upper()
-                if "MÊS" in up and "ACTIVIDADES" in up and "DIV" in up:
-                    continue
-                if up.startswith("CALEND"):
-                    continue
-
-                month_found = None
-                for m in MONTHS:
-                    if up == m:
-                        month_found = m
-                        break
-                    if up.startswith(m + " "):
-                        month_found = m
-                        line_text = line_text[len(m):].strip()
-                        break
-                if month_found:
-                    current_month = month_found
-                    if up == month_found:
-                        continue
-                if not current_month:
-                    continue
-
-                tokens = line_text.split()
-
-                div_idx = None
-                for i, t in enumerate(tokens):
-                    if t in ("ABS", "JOV"):
-                        div_idx = i
-                        break
-                if div_idx is None:
-                    continue
-                div = tokens[div_idx]
-
-                pre = tokens[:div_idx]
-                tipo_set = {"CIR", "FPP", "FOR", "INT"}
-                if len(pre) >= 2 and pre[-2] in tipo_set:
-                    day_text = " ".join(pre[:-2]).strip()
-                elif len(pre) >= 1 and pre[-1] in tipo_set:
-                    day_text = " ".join(pre[:-1]).strip()
-                else:
-                    day_text = " ".join(pre).strip()
-
-                rest = tokens[div_idx + 1:]
-                if not rest:
-                    continue
-
-                euro_idx = None
-                for i, t in enumerate(rest):
-                    if "€" in t:
-                        euro_idx = i
-                        break
-
-                class_end = euro_idx if euro_idx is not None else len(rest)
-                classe = ""
-                class_start = None
-
-                # "A definir"
-                for i in range(max(0, class_end - 3), class_end):
-                    if i + 1 < class_end and rest[i].lower() == "a" and rest[i + 1].lower().startswith("definir"):
-                        classe = "A definir"
-                        class_start = i
-                        break
-
-                # Valor de classe (número)
-                if not classe:
-                    for i in range(class_end - 1, -1, -1):
-                        if looks_like_money(rest[i]):
-                            class_start = i
-                            if i + 2 < class_end and rest[i + 1] == "/" and rest[i + 2][:1].isalpha():
-                                classe = " ".join(rest[i:i + 3])
-                            elif i + 1 < class_end and "/" in rest[i + 1]:
-                                classe = " ".join(rest[i:i + 2])
-                            else:
-                                classe = rest[i]
-                            break
-
-                if class_start is None:
-                    class_start = class_end
-
-                # Categorias
-                cat_start = None
-                for i, t in enumerate(rest):
-                    if i >= class_start:
-                        break
-                    if is_category_token(t):
-                        cat_start = i
-                        break
-                    if t == "M" and i + 2 < len(rest) and rest[i + 1] == "&" and rest[i + 2] == "F":
-                        cat_start = i
-                        break
-
-                if cat_start is None:
-                    actividade_tokens = rest[:class_start]
-                    categorias_tokens = []
-                else:
-                    actividade_tokens = rest[:cat_start]
-                    categorias_tokens = rest[cat_start:class_start]
-
-                if actividade_tokens and actividade_tokens[-1] == "FPP":
-                    actividade_tokens = actividade_tokens[:-1]
-
-                actividade = " ".join(actividade_tokens).strip()
-                categorias = " ".join(categorias_tokens).strip()
-
-                # Local / Organização por coordenadas
-                local_col = ""
-                org_col = ""
-                if x_local is not None and x_org is not None:
-                    margin = 2.0
-                    local_words = [
-                        w["text"] for w in lr["words"]
-                        if (w["x0"] >= x_local - margin) and (w["x0"] < x_org - margin)
-                    ]
-                    org_words = [
-                        w["text"] for w in lr["words"]
-                        if (w["x0"] >= x_org - margin)
-                    ]
-                    local_col = " ".join(local_words).strip()
-                    org_col = " ".join(org_words).strip()
-                    if local_col.upper() == "LOCAL":
-                        local_col = ""
-                    if org_col.upper().startswith("ORGAN"):
-                        org_col = ""
-
-                month_title = current_month.title()
-                month_num = MONTH_TO_NUM.get(month_title)
-                start_date, end_date = (None, None)
-                if month_num:
-                    start_date, end_date = parse_day_range_to_dates(day_text, month_num, year)
-
-                rows_out.append(
-                    {
-                        "Mes": month_title,
-                        "Dia": day_text,
-                        "DIV": div,
-                        "Actividade": actividade,
-                        "Categorias": categorias,
-                        "Classe": classe,
-                        "Local_pdf": local_col,
-                        "Organizacao_pdf": org_col,
-                        "Data_Inicio": start_date,
-                        "Data_Fim": end_date,
-                        "Data (mês + dia)": f"{month_title} {day_text}",
-                    }
-                )
-
-    df = pd.DataFrame(rows_out)
-    if df.empty:
+def load_calendar_df(pdf: DownloadRef, year: int) -> pd.DataFrame:
+    """Parse + normalização, com cache em disco pelo SHA-256 do PDF.
+
+    A chave do st.cache_data é só (url, sha256, caminho, ano): um hit em cada rerun custa
+    O(1), sem hashing do PDF. Um processo novo (restart/redeploy) lê o parquet em
+    milissegundos; só volta a fazer parse quando o conteúdo do PDF (ou FRAME_VERSION) muda.
+    Se a pré-visualização já leu este PDF, usa o frame dela (streamed_calendar_frames).
+    """
+    digest = pdf.digest
+    df = get_streamed_frame((digest, year))
+    if df is not None:
         return df
 
-    df = df[df["DIV"].isin(["ABS", "JOV"])].copy()
-    df.drop_duplicates(inplace=True)
+    df = load_cached_frame(digest, year, FRAME_VERSION)
+    if df is not None:
+        return df
 
-    df["Data_Inicio_dt"] = pd.to_datetime(df["Data_Inicio"], errors="coerce")
-    df.sort_values(["Data_Inicio_dt", "DIV", "Actividade"], inplace=True, na_position="last")
-    df.drop(columns=["Data_Inicio_dt"], inplace=True)
+    df = build_calendar_frame(parse_calendar_columns(pdf.path, year), year=year)
+    store_cached_frame(digest, year, FRAME_VERSION, df)
     return df
 
 
-def normalize_and_dedupe(df: pd.DataFrame) -> pd.DataFrame:
+def build_calendar_frame(cols: CalendarColumns, year: int) -> pd.DataFrame:
+    """Frame final a partir das linhas extraídas do PDF (já sem repetidos): texto, 'Local'/'Mapa' e datas."""
+    df = normalize_calendar_text(cols.to_frame())
+    return normalize_calendar_dates(resolve_calendar_locals(df), year=year)
+
+
+def resolve_calendar_locals(df: pd.DataFrame) -> pd.DataFrame:
+    """Local + Mapa, com a memo de locais em disco: só combinações nunca vistas são resolvidas."""
     if df is None or df.empty:
         return df
+    memo = load_local_memo(LOCAL_RESOLVER_VERSION)
+    seen = len(memo)
+    df = add_local_columns(df, build_local_dash_org, memo)
+    if len(memo) != seen:
+        store_local_memo(LOCAL_RESOLVER_VERSION, memo)
+    return df
 
-    out = df.copy()
 
-    for col in out.columns:
-        if out[col].dtype == object:
-            out[col] = (
-                out[col].astype("string")
-                .fillna("")
-                .str.replace(r"\s+", " ", regex=True)
-                .str.strip()
-                .replace({"": pd.NA})
-            )
-
-    key_cols = [
-        c
-        for c in [
-            "DIV",
-            "Actividade",
-            "Categorias",
-            "Classe",
-            "Local_pdf",
-            "Organizacao_pdf",
-            "Data_Inicio",
-            "Data_Fim",
-        ]
-        if c in out.columns
-    ]
-
-    if key_cols:
-        tmp = out[key_cols].astype("string").fillna("").agg("|".join, axis=1).str.lower()
-        out = out.loc[~tmp.duplicated(keep="first")].copy()
+@st.cache_resource(max_entries=4)
+def load_calendar_metrics(pdf: DownloadRef, year: int) -> dict[str, CalendarMetrics]:
+    """Índices das métricas por DIV, construídos uma vez por versão do calendário.
 
-    return out
+    cache_resource: o mesmo objecto (só leitura) serve todos os reruns e sessões, sem cópias.
+    """
+    return build_calendar_metrics(load_calendar_df(pdf, year=year))
 
 
-def build_local_dash_org(row):
-    """Constrói o campo 'Local' mostrado na tab Calendário.
+@st.cache_resource(max_entries=4)
+def load_calendar_query(pdf: DownloadRef, year: int) -> CalendarQuery:
+    """Índices dos filtros (mês, classe, divisão, datas, pesquisa) sobre o frame do load_calendar_df.
+
+    A versão (sha256 + ano + FRAME_VERSION) entra na chave da LRU de views filtradas.
+    """
+    return CalendarQuery(load_calendar_df(pdf, year=year), version=f"{pdf.digest}-{year}-v{FRAME_VERSION}")
+
+
+# Calendários lidos pela pré-visualização que ficam em memória (como o max_entries acima)
+STREAMED_FRAMES_MAX = 4
+
+
+@st.cache_resource
+def streamed_calendar_frames() -> tuple[threading.Lock, OrderedDict]:
+    """(lock, {(sha256, ano): frame final montado pela pré-visualização em streaming}).
+
+    Partilhado por todos os reruns e sessões: um PDF já lido não volta a ser lido,
+    mesmo que a cache em disco não seja gravável (os erros de escrita são engolidos).
+    As sessões correm em threads, por isso todos os acessos passam pelo lock.
+    """
+    return threading.Lock(), OrderedDict()
+
+
+def get_streamed_frame(key: tuple[str, int]) -> pd.DataFrame | None:
+    lock, frames = streamed_calendar_frames()
+    with lock:
+        return frames.get(key)
+
+
+def put_streamed_frame(key: tuple[str, int], df: pd.DataFrame) -> None:
+    lock, frames = streamed_calendar_frames()
+    with lock:
+        frames[key] = df
+        frames.move_to_end(key)
+        while len(frames) > STREAMED_FRAMES_MAX:
+            frames.popitem(last=False)
+
+
+def stream_calendar_pages(pdf: DownloadRef, year: int):
+    """Pré-visualização em streaming quando o PDF ainda não foi lido.
+
+    Gera um frame por página (ver iter_calendar_frames); a mesma passagem acumula as
+    linhas do frame final, que é normalizado, guardado em disco e registado em
+    streamed_calendar_frames para o load_calendar_df seguinte. Se o calendário já
+    estiver em memória ou em disco não gera nada.
+    """
+    key = (pdf.digest, year)
+    if get_streamed_frame(key) is not None or has_cached_frame(pdf.digest, year, FRAME_VERSION):
+        return
+
+    cols = CalendarColumns()
+    yield from iter_calendar_frames(pdf.path, year, into=cols)
+
+    df = build_calendar_frame(cols, year=year)
+    store_cached_frame(pdf.digest, year, FRAME_VERSION, df)
+    put_streamed_frame(key, df)
+
+
+def build_local_dash_org(df: pd.DataFrame) -> pd.Series:
+    """Constrói o campo 'Local' mostrado na tab Calendário (uma coluna de cada vez).
 
     Preferência:
       1) Local_pdf / Organizacao_pdf (colunas do PDF)
       2) Fallback: inferir local a partir do texto de 'Actividade' (ex.: 'FIP Bronze Portimão ...')
+    Linhas sem local ficam com "".
     """
-    loc = row.get("Local_pdf")
-    org = row.get("Organizacao_pdf")
+    def col(name: str) -> pd.Series:
+        if name not in df.columns:
+            return pd.Series("", index=df.index, dtype=TEXT_DTYPE)
+        return df[name].astype(TEXT_DTYPE).fillna("").str.strip()
 
-    loc = "" if pd.isna(loc) else str(loc).strip()
-    org = "" if pd.isna(org) else str(org).strip()
+    loc = col("Local_pdf")
+    org = col("Organizacao_pdf")
 
-    if loc and org:
-        return f"{loc} - {org}"
-    if loc:
-        return loc
-    if org:
-        return org
+    out = loc.where(loc != "", org)
+    out = out.mask((loc != "") & (org != ""), loc + " - " + org)
 
     # --- Fallback (PDF mudou e as colunas Local/Organização vieram vazias) ---
-    act = row.get("Actividade")
-    act = "" if pd.isna(act) else str(act).strip()
-
-    # Padrões típicos no calendário FPPadel:
-    #   "FIP Bronze Portimão FPP ..."
-    #   "FIP Silver Lisboa FPP ..."
-    #   "FIP Silver Porto FPP ..."
-    m = re.search(
-        r"\bFIP\s+(?:Bronze|Silver|Gold|Platinum)\s+([^\d]+?)(?:\s+FPP\b|\s*$)",
-        act,
-        flags=re.IGNORECASE,
-    )
-    if m:
-        cand = m.group(1).strip(" -–—|")
-        cand = re.sub(r"\s+", " ", cand).strip()
-        if cand:
-            return cand
+    todo = (out == "").to_numpy()
+    if todo.any():
+        act = col("Actividade")[todo]
+
+        # Padrões típicos no calendário FPPadel:
+        #   "FIP Bronze Portimão FPP ..."
+        #   "FIP Silver Lisboa FPP ..."
+        #   "FIP Silver Porto FPP ..."
+        cand = (
+            act.str.extract(
+                r"\bFIP\s+(?:Bronze|Silver|Gold|Platinum)\s+([^\d]+?)(?:\s+FPP\b|\s*$)",
+                flags=re.IGNORECASE,
+            )[0]
+            .fillna("")
+            .str.strip(" -–—|")
+            .str.replace(r"\s+", " ", regex=True)
+            .str.strip()
+        )
+
+        # Outros casos: a cidade pode estar no fim antes de 'FPP'
+        ends_fpp = act.str.contains(r"\bFPP\b\s*$", case=False, regex=True)
+        before_fpp = act.str.extract(r"([A-Za-zÀ-ÿ][A-Za-zÀ-ÿ\-]+)\s+FPP\b")[0].fillna("").str.strip()
+        cand = cand.where(cand != "", before_fpp.where(ends_fpp, ""))
+
+        out.loc[todo] = cand
 
-    # Outros casos: a cidade pode estar no fim antes de 'FPP'
-    if re.search(r"\bFPP\b\s*$", act, flags=re.IGNORECASE):
-        m3 = re.search(r"([A-Za-zÀ-ÿ][A-Za-zÀ-ÿ\-]+)\s+FPP\b", act)
-        if m3:
-            return m3.group(1).strip()
-
-    return ""
+    return out
 
 
 
@@ -459,9 +343,11 @@ if main_view == "📅 Calendário":
     render_calendar(
         find_latest_calendar_pdf_url=find_latest_calendar_pdf_url,
         infer_year_from_pdf_url=infer_year_from_pdf_url,
-        download_pdf_bytes=download_pdf_bytes,
-        parse_calendar_pdf=parse_calendar_pdf,
-        normalize_and_dedupe=normalize_and_dedupe,
+        download_pdf_file=download_pdf_file,
+        load_calendar_df=load_calendar_df,
+        stream_calendar_pages=stream_calendar_pages,
+        load_calendar_metrics=load_calendar_metrics,
+        load_calendar_query=load_calendar_query,
         build_local_dash_org=build_local_dash_org,
         month_sort_key=month_sort_key,
         is_mobile=is_mobile,
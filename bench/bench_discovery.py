@@ -0,0 +1,85 @@
+"""Micro-benchmark da descoberta do PDF do calendário (extracção dos links da homepage).
+
+Compara o HTMLParser de modules/calendar_links.py com a versão antiga (BeautifulSoup,
+duas passagens pela árvore) sobre uma cópia guardada da homepage, e confirma que as
+duas devolvem os mesmos candidatos.
+
+    python bench/bench_discovery.py [--repeat 50] [--scale 1]
+
+--scale N repete o <body> N vezes, para ver o custo a crescer com o tamanho da página.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import argparse
+import timeit
+from urllib.parse import urljoin
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from modules.calendar_links import extract_calendar_pdf_links  # noqa: E402
+
+HOME_URL = "https://fppadel.pt/"
+FIXTURE = os.path.join(ROOT, "bench", "fixtures", "fppadel_home.html")
+
+
+def extract_with_soup(html: str) -> list[str]:
+    """Implementação anterior (find_latest_calendar_pdf_url antes do HTMLParser)."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    candidates: list[str] = []
+
+    for a in soup.find_all("a", href=True):
+        href = a["href"].strip()
+        text = (a.get_text() or "").strip().lower()
+        if "saber mais" in text and href.lower().endswith(".pdf") and "calend" in href.lower():
+            candidates.append(urljoin(HOME_URL, href))
+
+    if not candidates:
+        for a in soup.find_all("a", href=True):
+            href = a["href"].strip()
+            if href.lower().endswith(".pdf") and "calend" in href.lower():
+                candidates.append(urljoin(HOME_URL, href))
+    return candidates
+
+
+def load_fixture(scale: int) -> str:
+    with open(FIXTURE, "r", encoding="utf-8") as f:
+        html = f.read()
+    if scale <= 1:
+        return html
+    head, _, rest = html.partition("<body")
+    body, _, tail = rest.partition("</body>")
+    return head + "<body" + body * scale + "</body>" + tail
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--repeat", type=int, default=50)
+    ap.add_argument("--scale", type=int, default=1)
+    args = ap.parse_args()
+
+    html = load_fixture(args.scale)
+    links = extract_calendar_pdf_links(html, HOME_URL)
+    print(f"página: {len(html) / 1024:.0f} KiB, candidatos: {len(links)}")
+
+    timings = {"htmlparser": lambda: extract_calendar_pdf_links(html, HOME_URL)}
+    try:
+        soup_links = extract_with_soup(html)
+    except ImportError:
+        print("bs4 não instalado: só o HTMLParser é medido")
+    else:
+        if soup_links != links:
+            raise SystemExit(f"candidatos diferentes:\n  htmlparser: {links}\n  soup:       {soup_links}")
+        timings["beautifulsoup"] = lambda: extract_with_soup(html)
+
+    for name, fn in timings.items():
+        best = min(timeit.repeat(fn, number=1, repeat=args.repeat))
+        print(f"{name:>14}: {best * 1000:8.2f} ms (melhor de {args.repeat})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,376 @@
+"""Cache em disco do calendário FPPadel.
+
+Sobrevive a restarts/redeploys do processo (ao contrário do st.cache_data),
+para que um processo "frio" não tenha de voltar a fazer parse do PDF inteiro.
+Tudo aqui é best-effort: qualquer erro de I/O devolve None e o caller recalcula.
+"""
+from __future__ import annotations
+
+import os
+import json
+import time
+import hashlib
+import tempfile
+from typing import NamedTuple
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+
+import pandas as pd
+import requests
+
+
+CACHE_DIR = os.environ.get(
+    "FPPADEL_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "calendario"),
+)
+
+
+# =================================================
+# HELPERS
+# =================================================
+
+def _cache_path(*parts: str) -> str:
+    return os.path.join(CACHE_DIR, *parts)
+
+
+def _temp_path(directory: str, prefix: str) -> str:
+    """Ficheiro temporário único por chamada (as sessões do Streamlit são threads do mesmo
+    processo: um nome só com o pid seria partilhado por escritas concorrentes)."""
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=prefix, suffix=".tmp")
+    os.close(fd)
+    return tmp
+
+
+def _atomic_write(path: str, write_fn) -> None:
+    """Escreve para um ficheiro temporário e faz rename (nunca deixa ficheiros a meio)."""
+    tmp = _temp_path(os.path.dirname(path), f"{os.path.basename(path)}.")
+    try:
+        write_fn(tmp)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+# =================================================
+# DATAFRAMES (parquet)
+# =================================================
+
+def _frame_path(digest: str, year: int, parser_version: str) -> str:
+    return _cache_path("frames", f"{digest}-{year}-v{parser_version}.parquet")
+
+
+def has_cached_frame(digest: str, year: int, parser_version: str) -> bool:
+    return os.path.exists(_frame_path(digest, year, parser_version))
+
+
+def load_cached_frame(digest: str, year: int, parser_version: str) -> pd.DataFrame | None:
+    path = _frame_path(digest, year, parser_version)
+    if not os.path.exists(path):
+        return None
+    try:
+        return pd.read_parquet(path)
+    except Exception:
+        return None
+
+
+def store_cached_frame(digest: str, year: int, parser_version: str, df: pd.DataFrame) -> None:
+    if df is None:
+        return
+    try:
+        _atomic_write(
+            _frame_path(digest, year, parser_version),
+            lambda tmp: df.to_parquet(tmp),
+        )
+    except Exception:
+        pass
+
+
+# =================================================
+# PÁGINAS (linhas classificadas por fingerprint de página)
+# =================================================
+
+def _page_path(fingerprint: str, parser_version: str) -> str:
+    return _cache_path("pages", f"{fingerprint}-v{parser_version}.json")
+
+
+def load_page_entries(fingerprint: str, parser_version: str) -> list[tuple] | None:
+    path = _page_path(fingerprint, parser_version)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return [tuple(e) for e in json.load(f)]
+    except Exception:
+        return None
+
+
+def store_page_entries(fingerprint: str, parser_version: str, entries: list[tuple]) -> None:
+    def write(tmp: str):
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(entries, f, ensure_ascii=False)
+
+    try:
+        _atomic_write(_page_path(fingerprint, parser_version), write)
+    except Exception:
+        pass
+
+
+def load_page_header(fingerprint: str, parser_version: str) -> dict | None:
+    """Cabeçalho da tabela detectado nesta página: {"header": dict|None}, ou None se nunca visto."""
+    data = _read_json(_cache_path("pages", f"{fingerprint}-header-v{parser_version}.json"))
+    return data if "header" in data else None
+
+
+def store_page_header(fingerprint: str, parser_version: str, header: dict | None) -> None:
+    _write_json(_cache_path("pages", f"{fingerprint}-header-v{parser_version}.json"), {"header": header})
+
+
+# =================================================
+# MEMO DE LOCAIS (combinação de colunas -> 'Local' resolvido)
+# =================================================
+
+def _local_memo_path(resolver_version: str) -> str:
+    return _cache_path("locals", f"memo-v{resolver_version}.json")
+
+
+def load_local_memo(resolver_version: str) -> dict[str, str]:
+    """Memo partilhada por todas as revisões do PDF; {} se não existir ou estiver estragada."""
+    return _read_json(_local_memo_path(resolver_version))
+
+
+def store_local_memo(resolver_version: str, memo: dict[str, str]) -> None:
+    _write_json(_local_memo_path(resolver_version), memo)
+
+
+# =================================================
+# HTTP (revalidação condicional: ETag / Last-Modified)
+# =================================================
+
+def _http_paths(url: str) -> tuple[str, str]:
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    return _cache_path("http", f"{key}.json"), _cache_path("http", f"{key}.body")
+
+
+def _read_json(path: str) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except Exception:
+        return {}
+
+
+def _write_json(path: str, data: dict) -> None:
+    def write(tmp: str):
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+    try:
+        _atomic_write(path, write)
+    except Exception:
+        pass
+
+
+def _read_cached_body(url: str) -> tuple[dict, bytes | None]:
+    """Devolve (validadores, corpo) — corpo None se faltar ou não bater com o tamanho guardado."""
+    meta_path, body_path = _http_paths(url)
+    meta = _read_json(meta_path)
+    if not meta or not os.path.exists(body_path):
+        return {}, None
+    try:
+        with open(body_path, "rb") as f:
+            body = f.read()
+    except Exception:
+        return {}, None
+    if meta.get("content_length") is not None and len(body) != meta["content_length"]:
+        return {}, None
+    return meta, body
+
+
+def conditional_get(url: str, timeout: int = 30) -> bytes:
+    """GET com revalidação: envia If-None-Match / If-Modified-Since se já houver cópia local.
+
+    304 -> devolve a cópia em disco (só actualiza 'checked_at', nenhum byte do corpo viaja).
+    200 -> guarda corpo + validadores (ETag, Last-Modified, tamanho) para a próxima vez.
+    """
+    meta, body = _read_cached_body(url)
+
+    headers = {}
+    if body is not None:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    r = requests.get(url, headers=headers, timeout=timeout)
+    meta_path, body_path = _http_paths(url)
+
+    if r.status_code == 304 and body is not None:
+        meta["checked_at"] = time.time()
+        _write_json(meta_path, meta)
+        return body
+
+    r.raise_for_status()
+    content = r.content
+
+    def write(tmp: str):
+        with open(tmp, "wb") as f:
+            f.write(content)
+
+    try:
+        _atomic_write(body_path, write)
+        _write_json(
+            meta_path,
+            {
+                "url": url,
+                "etag": r.headers.get("ETag"),
+                "last_modified": r.headers.get("Last-Modified"),
+                "content_length": len(content),
+                "checked_at": time.time(),
+            },
+        )
+    except Exception:
+        pass
+    return content
+
+
+def _download_path(digest: str, suffix: str) -> str:
+    return _cache_path("files", f"{digest}{suffix}")
+
+
+class DownloadRef(NamedTuple):
+    """Identidade barata de um ficheiro descarregado: URL + SHA-256 (calculado uma vez,
+    no download) + caminho local. Serve de chave de cache em O(1), sem voltar a ler o PDF."""
+
+    url: str
+    digest: str
+    path: str
+
+
+def conditional_download(url: str, timeout: int = 30, chunk_size: int = 64 * 1024) -> DownloadRef:
+    """Como conditional_get, mas o corpo vai em streaming (iter_content) directamente para
+    um ficheiro endereçado pelo conteúdo (files/<sha256><ext>).
+
+    O PDF nunca fica inteiro em memória; o SHA-256 é calculado durante a escrita.
+    """
+    meta_path, _ = _http_paths(url)
+    meta = _read_json(meta_path)
+
+    path = None
+    if meta.get("digest"):
+        cand = _download_path(meta["digest"], meta.get("suffix", ""))
+        if os.path.exists(cand) and os.path.getsize(cand) == meta.get("content_length"):
+            path = cand
+
+    headers = {}
+    if path:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    with requests.get(url, headers=headers, timeout=timeout, stream=True) as r:
+        if r.status_code == 304 and path:
+            meta["checked_at"] = time.time()
+            _write_json(meta_path, meta)
+            return DownloadRef(url, meta["digest"], path)
+
+        r.raise_for_status()
+
+        suffix = os.path.splitext(url.split("?", 1)[0])[1].lower()
+        h = hashlib.sha256()
+        size = 0
+        tmp = _temp_path(_cache_path("files"), "download.")
+        try:
+            with open(tmp, "wb") as f:
+                for chunk in r.iter_content(chunk_size=chunk_size):
+                    if chunk:
+                        f.write(chunk)
+                        h.update(chunk)
+                        size += len(chunk)
+            digest = h.hexdigest()
+            path = _download_path(digest, suffix)
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+        _write_json(
+            meta_path,
+            {
+                "url": url,
+                "etag": r.headers.get("ETag"),
+                "last_modified": r.headers.get("Last-Modified"),
+                "content_length": size,
+                "digest": digest,
+                "suffix": suffix,
+                "checked_at": time.time(),
+            },
+        )
+    return DownloadRef(url, digest, path)
+
+
+# =================================================
+# HEAD PROBES (candidatos a PDF do calendário)
+# =================================================
+
+# Os uploads do WordPress são imutáveis por URL (cada revisão tem nome novo),
+# por isso um probe recente chega para saltar o HEAD na próxima descoberta.
+PROBE_TTL_SECONDS = 7 * 86400
+
+
+def _probe_one(url: str, timeout: int) -> dict:
+    try:
+        r = requests.head(url, allow_redirects=True, timeout=timeout)
+    except Exception:
+        return {"ok": False, "checked_at": time.time()}
+
+    last_modified = r.headers.get("Last-Modified")
+    lm_ts = None
+    if last_modified:
+        try:
+            lm_ts = parsedate_to_datetime(last_modified).timestamp()
+        except Exception:
+            lm_ts = None
+
+    try:
+        length = int(r.headers.get("Content-Length") or 0)
+    except ValueError:
+        length = 0
+
+    return {
+        "ok": r.status_code < 400,
+        "status": r.status_code,
+        "etag": r.headers.get("ETag"),
+        "last_modified": last_modified,
+        "last_modified_ts": lm_ts,
+        "content_length": length,
+        "checked_at": time.time(),
+    }
+
+
+def probe_urls(urls: list[str], timeout: int = 10, max_workers: int = 8) -> dict[str, dict]:
+    """HEAD concorrente a cada URL; reutiliza probes em disco com menos de PROBE_TTL_SECONDS."""
+    path = _cache_path("probes.json")
+    cached = _read_json(path)
+    now = time.time()
+
+    results: dict[str, dict] = {}
+    todo: list[str] = []
+    for u in dict.fromkeys(urls):
+        p = cached.get(u)
+        if p and p.get("ok") and now - p.get("checked_at", 0) < PROBE_TTL_SECONDS:
+            results[u] = p
+        else:
+            todo.append(u)
+
+    if todo:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(todo))) as ex:
+            for u, p in zip(todo, ex.map(lambda x: _probe_one(x, timeout), todo)):
+                results[u] = p
+                cached[u] = p
+        _write_json(path, cached)
+
+    return results
@@ -0,0 +1,316 @@
+"""Índices pré-calculados sobre o calendário carregado (um por versão do PDF).
+
+Construídos uma vez por calendário e partilhados (só leitura) por todos os reruns:
+as métricas de cada view passam a ser pesquisas binárias em arrays ordenados,
+em vez de filtros e ordenações sobre cópias do frame.
+"""
+from __future__ import annotations
+
+import os
+import datetime as dt
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from unidecode import unidecode
+
+
+DIV_ALL = "ALL"
+DIVS = ("ABS", "JOV")
+
+
+def _days(s: pd.Series) -> np.ndarray:
+    return pd.to_datetime(s, errors="coerce").to_numpy(dtype="datetime64[D]")
+
+
+class CalendarMetrics:
+    """Datas de início/fim de um conjunto de eventos, ordenadas para métricas em O(log n)."""
+
+    __slots__ = ("starts", "regular_ends", "odd_starts", "odd_ends")
+
+    def __init__(self, data_inicio: pd.Series, data_fim: pd.Series):
+        start = _days(data_inicio)
+        end = _days(data_fim)
+        ok = ~np.isnat(start) & ~np.isnat(end)
+        start, end = start[ok], end[ok]
+
+        regular = end >= start
+        self.starts = np.sort(start)
+        self.regular_ends = np.sort(end[regular])
+        # Data_Fim ainda antes do início (ex.: "28 a 1/01" em Dezembro): poucos, vistos um a um
+        self.odd_starts = start[~regular]
+        self.odd_ends = end[~regular]
+
+    def next_start(self, today: dt.date) -> pd.Timestamp | None:
+        """Primeira data de início >= today (None se não houver)."""
+        i = int(np.searchsorted(self.starts, np.datetime64(today, "D"), side="left"))
+        return pd.Timestamp(self.starts[i]) if i < len(self.starts) else None
+
+    def count_overlapping(self, start: dt.date, end: dt.date) -> int:
+        """Eventos a decorrer em [start, end]: início <= end e fim >= start."""
+        s = np.datetime64(start, "D")
+        e = np.datetime64(end, "D")
+        # todos os que começam até 'end'...
+        n = int(np.searchsorted(self.starts, e, side="right"))
+        # ...menos os que já acabaram antes de 'start' (nos regulares, esses começaram antes de 'end')
+        n -= int(np.searchsorted(self.regular_ends, s, side="left"))
+        n -= int(np.count_nonzero((self.odd_starts <= e) & (self.odd_ends < s)))
+        return n
+
+
+def build_calendar_metrics(df: pd.DataFrame) -> dict[str, CalendarMetrics]:
+    """CalendarMetrics por DIV ("ABS", "JOV") e para o conjunto ("ALL")."""
+    out = {DIV_ALL: CalendarMetrics(df["Data_Inicio"], df["Data_Fim"])}
+    for div in DIVS:
+        sub = df[df["DIV"] == div]
+        out[div] = CalendarMetrics(sub["Data_Inicio"], sub["Data_Fim"])
+    return out
+
+
+# =================================================
+# PESQUISA (texto sem acentos + índice de trigramas)
+# =================================================
+
+SEARCH_COLS = ["Data (mês + dia)", "DIV", "Categorias", "Classe", "Local", "Mes"]
+# separa as colunas no documento de cada linha: uma pesquisa nunca atravessa duas colunas
+_COL_SEP = "\x1f"
+
+
+def normalize_search_text(text) -> str:
+    """"  Setúbal  CP " -> "setubal cp" (unidecode + minúsculas + espaços colapsados)."""
+    return " ".join(unidecode("" if text is None else str(text)).lower().split())
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class CalendarSearchIndex:
+    """Um documento normalizado por linha + índice invertido de trigramas.
+
+    Uma pesquisa é uma substring (sem acentos/maiúsculas) de alguma das SEARCH_COLS, como
+    antes — "setubal" encontra "Setúbal", "lis" encontra "Lisboa". Os trigramas da pesquisa
+    reduzem os candidatos por intersecção; só esses são confirmados com `in`.
+    """
+
+    __slots__ = ("docs", "postings")
+
+    def __init__(self, df: pd.DataFrame):
+        cols = []
+        for c in SEARCH_COLS:
+            if c not in df.columns:
+                continue
+            values = df[c].astype(object).where(df[c].notna(), "")
+            folded = {v: normalize_search_text(v) for v in pd.unique(values)}
+            cols.append([folded[v] for v in values])
+        self.docs = [_COL_SEP.join(parts) for parts in zip(*cols)] if cols else [""] * len(df)
+
+        postings: dict[str, list[int]] = {}
+        for i, doc in enumerate(self.docs):
+            for g in _trigrams(doc):
+                if _COL_SEP not in g:
+                    postings.setdefault(g, []).append(i)
+        self.postings = {g: np.asarray(ids, dtype=np.int64) for g, ids in postings.items()}
+
+    def search(self, query: str) -> np.ndarray:
+        """Posições (ordenadas) das linhas cujo texto contém a pesquisa."""
+        q = normalize_search_text(query)
+        if not q:
+            return np.arange(len(self.docs))
+
+        grams = _trigrams(q)
+        if grams:
+            lists = [self.postings.get(g) for g in grams]
+            if any(ids is None for ids in lists):
+                return np.empty(0, dtype=np.int64)
+            lists.sort(key=len)
+            cand = lists[0]
+            for ids in lists[1:]:
+                cand = np.intersect1d(cand, ids, assume_unique=True)
+        else:
+            # 1-2 caracteres: sem trigramas, confirma-se em todas as linhas
+            cand = range(len(self.docs))
+
+        docs = self.docs
+        return np.asarray([i for i in cand if q in docs[i]], dtype=np.int64)
+
+
+# =================================================
+# LRU DE VIEWS FILTRADAS (partilhada pelo processo)
+# =================================================
+
+class ViewCache:
+    """LRU limitada de resultados de CalendarQuery.select, com contadores de hits/misses.
+
+    Partilhada por todas as sessões do processo (os reruns do Streamlit correm em threads,
+    daí o lock). Os valores são arrays de posições só de leitura. maxsize <= 0 desliga a
+    cache: cada pedido é calculado e nada é guardado.
+    """
+
+    __slots__ = ("maxsize", "hits", "misses", "_data", "_lock")
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+
+        value = compute()
+        value.setflags(write=False)
+        if self.maxsize <= 0:
+            return value
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._data), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+def _view_cache_size(value: str | None, default: int = 256) -> int:
+    """FPPADEL_VIEW_CACHE_SIZE: inteiro (<= 0 desliga a cache); valores inválidos usam o default."""
+    try:
+        return int((value or "").strip() or default)
+    except ValueError:
+        return default
+
+
+VIEW_CACHE = ViewCache(maxsize=_view_cache_size(os.environ.get("FPPADEL_VIEW_CACHE_SIZE")))
+
+
+# =================================================
+# QUERY ENGINE (mês / classe / divisão / datas / pesquisa)
+# =================================================
+
+def _group_positions(values: pd.Series) -> dict[str, np.ndarray]:
+    """valor -> posições (ordenadas) das linhas com esse valor; NA fica de fora."""
+    codes, uniques = pd.factorize(values)
+    order = np.argsort(codes, kind="stable")
+    bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1), side="left")
+    return {str(u): order[bounds[i]:bounds[i + 1]] for i, u in enumerate(uniques)}
+
+
+class CalendarQuery:
+    """Filtros do calendário respondidos sem copiar o frame.
+
+    Mês, classe e divisão são conjuntos de posições pré-calculados (intersectados por
+    np.intersect1d); o filtro de datas é um índice de intervalos: posições ordenadas por
+    início e por fim, cortadas por pesquisa binária; a pesquisa usa o CalendarSearchIndex.
+    O resultado são posições (iloc) já na ordem cronológica da tabela (Data_Inicio, DIV, Categorias).
+
+    Com `version` (identidade do calendário), os resultados ficam na VIEW_CACHE: combinações
+    de filtros repetidas (por qualquer sessão) não voltam a ser calculadas.
+    """
+
+    __slots__ = (
+        "n", "by_div", "by_month", "by_class", "options",
+        "start_order", "starts", "end_order", "ends", "rank", "text", "version",
+    )
+
+    def __init__(self, df: pd.DataFrame, version: str | None = None):
+        self.version = version
+        self.n = len(df)
+        self.by_div = _group_positions(df["DIV"])
+        self.by_month = _group_positions(df["Mes"])
+        self.by_class = _group_positions(df["Classe"])
+
+        # opções dos filtros (meses/classes presentes) por divisão; None = todas
+        self.options = {}
+        for div in [None, *self.by_div]:
+            rows = self.by_div[div] if div else None
+            self.options[div] = (
+                self._present(self.by_month, rows),
+                [c for c in self._present(self.by_class, rows) if c.strip()],
+            )
+
+        start = _days(df["Data_Inicio"])
+        end = _days(df["Data_Fim"])
+        dated = np.flatnonzero(~np.isnat(start) & ~np.isnat(end))
+        self.start_order = dated[np.argsort(start[dated], kind="stable")]
+        self.starts = start[self.start_order]
+        self.end_order = dated[np.argsort(end[dated], kind="stable")]
+        self.ends = end[self.end_order]
+
+        keys = df[["Data_Inicio", "DIV", "Categorias"]].reset_index(drop=True)
+        display = keys.sort_values(["Data_Inicio", "DIV", "Categorias"], na_position="last", kind="mergesort").index
+        self.rank = np.empty(self.n, dtype=np.int64)
+        self.rank[display.to_numpy()] = np.arange(self.n)
+
+        self.text = CalendarSearchIndex(df)
+
+    @staticmethod
+    def _present(groups: dict[str, np.ndarray], rows: np.ndarray | None) -> list[str]:
+        if rows is None:
+            return list(groups)
+        return [k for k, pos in groups.items() if len(np.intersect1d(pos, rows, assume_unique=True))]
+
+    def months(self, div: str | None = None) -> list[str]:
+        return self.options.get(div, ([], []))[0]
+
+    def classes(self, div: str | None = None) -> list[str]:
+        return self.options.get(div, ([], []))[1]
+
+    def overlapping(self, start: dt.date, end: dt.date) -> np.ndarray:
+        """Posições (ordenadas) com início <= end e fim >= start."""
+        began = self.start_order[: np.searchsorted(self.starts, np.datetime64(end, "D"), side="right")]
+        ended = self.end_order[: np.searchsorted(self.ends, np.datetime64(start, "D"), side="left")]
+        # com assume_unique o setdiff1d mantém a ordem de 'began' (por início), não a posição
+        return np.sort(np.setdiff1d(began, ended, assume_unique=True))
+
+    def select(
+        self,
+        div: str | None = None,
+        month: str | None = None,
+        classes=(),
+        start: dt.date | None = None,
+        end: dt.date | None = None,
+        search: str = "",
+    ) -> np.ndarray:
+        """Posições das linhas que passam todos os filtros, na ordem da tabela."""
+        if self.version is None:
+            return self._select(div, month, classes, start, end, search)
+
+        # a janela de datas já chega resolvida em datas concretas (ex.: "Próximos 7 dias" de hoje)
+        key = (self.version, div, month, tuple(sorted(classes)), start, end, normalize_search_text(search))
+        return VIEW_CACHE.get_or_compute(key, lambda: self._select(div, month, classes, start, end, search))
+
+    def _select(self, div, month, classes, start, end, search) -> np.ndarray:
+        empty = np.empty(0, dtype=np.int64)
+        sets = []
+        if div:
+            sets.append(self.by_div.get(div, empty))
+        if month:
+            sets.append(self.by_month.get(month, empty))
+        if classes:
+            sets.append(np.sort(np.concatenate([self.by_class.get(c, empty) for c in classes])))
+        if start is not None and end is not None:
+            sets.append(self.overlapping(start, end))
+        if search.strip():
+            sets.append(self.text.search(search))
+
+        if not sets:
+            ids = np.arange(self.n)
+        else:
+            sets.sort(key=len)
+            ids = sets[0]
+            for other in sets[1:]:
+                ids = np.intersect1d(ids, other, assume_unique=True)
+        return ids[np.argsort(self.rank[ids], kind="stable")]
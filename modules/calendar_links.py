@@ -0,0 +1,58 @@
+"""Descoberta dos links do PDF do calendário na homepage da FPPadel (sem Streamlit)."""
+from __future__ import annotations
+
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+
+class _CalendarLinkParser(HTMLParser):
+    """Extrai só os <a href> que apontam para PDFs do calendário (sem construir árvore DOM).
+
+    Guarda (href, texto) apenas desses links; o resto da página é só tokenizado.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.links: list[tuple[str, str]] = []
+        self._href: str | None = None
+        self._text: list[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag != "a":
+            return
+        self._flush()
+        href = (dict(attrs).get("href") or "").strip()
+        low = href.lower()
+        if low.endswith(".pdf") and "calend" in low:
+            self._href = href
+            self._text = []
+
+    def handle_endtag(self, tag):
+        if tag == "a":
+            self._flush()
+
+    def handle_data(self, data):
+        if self._href is not None:
+            self._text.append(data)
+
+    def close(self):
+        super().close()
+        self._flush()
+
+    def _flush(self):
+        if self._href is not None:
+            self.links.append((self._href, "".join(self._text).strip().lower()))
+            self._href = None
+            self._text = []
+
+
+def extract_calendar_pdf_links(html: str, base_url: str) -> list[str]:
+    """Links 'Saber mais' para PDFs do calendário; se não houver, qualquer PDF do calendário."""
+    parser = _CalendarLinkParser()
+    parser.feed(html)
+    parser.close()
+
+    saber_mais = [urljoin(base_url, h) for h, text in parser.links if "saber mais" in text]
+    if saber_mais:
+        return saber_mais
+    return [urljoin(base_url, h) for h, _ in parser.links]
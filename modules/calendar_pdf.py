@@ -0,0 +1,892 @@
+"""Parser do PDF do calendário FPPadel (sem Streamlit).
+
+Cada página é classificada de forma independente (linhas de mês + linhas de tabela),
+o que permite processar páginas em paralelo e reaproveitar páginas inalteradas entre
+revisões do PDF; o único estado entre páginas é o mês corrente, resolvido depois numa
+passagem sequencial barata (stitch_pages).
+"""
+from __future__ import annotations
+
+import os
+import re
+import json
+import hashlib
+import multiprocessing
+import datetime as dt
+from io import BytesIO
+from array import array
+from functools import lru_cache
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pdfplumber
+from pdfminer.psparser import LIT
+from pdfminer.pdftypes import PDFObjRef, PDFStream, resolve1
+
+from modules.calendar_cache import (
+    load_page_entries,
+    load_page_header,
+    store_page_entries,
+    store_page_header,
+)
+
+
+MONTHS = [
+    "JANEIRO", "FEVEREIRO", "MARÇO", "ABRIL", "MAIO", "JUNHO",
+    "JULHO", "AGOSTO", "SETEMBRO", "OUTUBRO", "NOVEMBRO", "DEZEMBRO",
+]
+MONTH_TO_NUM = {m.title(): i for i, m in enumerate(MONTHS, start=1)}
+MONTH_SET = set(MONTHS)
+
+# Subir sempre que o parser/normalização mudar o resultado (invalida as caches em disco)
+PARSER_VERSION = "5"
+
+def _parse_workers(value: str) -> int:
+    """Valor de FPPADEL_PARSE_WORKERS; qualquer valor inválido cai para 1 (sequencial)."""
+    value = value.strip().lower()
+    if value == "auto":
+        return os.cpu_count() or 1
+    try:
+        return max(1, int(value or 1))
+    except ValueError:
+        return 1
+
+
+# Nº de processos para o parse por página: sequencial por omissão; o modo paralelo é
+# opt-in (FPPADEL_PARSE_WORKERS=N, ou "auto" para um processo por CPU)
+PARSE_WORKERS = _parse_workers(os.environ.get("FPPADEL_PARSE_WORKERS", ""))
+
+# Os processos do pool arrancam com "spawn": fazer fork do servidor do Streamlit
+# (multi-threaded) pode herdar locks presos noutras threads
+_MP_CONTEXT = multiprocessing.get_context("spawn")
+
+# Modo de extracção:
+#   "page"  -> extract_words da página inteira; cabeçalho (LOCAL/ORGAN) procurado em cada página
+#   "table" -> cabeçalho detectado uma vez e reutilizado; extracção só na região da tabela
+PARSE_MODE = os.environ.get("FPPADEL_PARSE_MODE", "page")
+
+# No modo "table", o cabeçalho é procurado só nas primeiras páginas
+HEADER_SCAN_PAGES = 3
+
+# Motor que parte cada linha em campos:
+#   "tokens" -> heurísticas sobre os tokens (DIV, dinheiro, categorias...); só LOCAL/ORGAN por x
+#   "bands"  -> todas as colunas por faixas de x derivadas do cabeçalho
+PARSE_ENGINE = os.environ.get("FPPADEL_PARSE_ENGINE", "tokens")
+
+# prefixo (em maiúsculas) da palavra do cabeçalho -> campo
+HEADER_COLUMNS = [
+    ("MÊS", "Mes"),
+    ("MES", "Mes"),
+    ("DIA", "Dia"),
+    ("TIPO", "Tipo"),
+    ("DIV", "DIV"),
+    ("ACTIV", "Actividade"),
+    ("ATIV", "Actividade"),
+    ("CATEG", "Categorias"),
+    ("CLASS", "Classe"),
+    ("LOCAL", "Local_pdf"),
+    ("ORGAN", "Organizacao_pdf"),
+]
+
+
+def parse_day_range_to_dates(day_text: str, month_num: int, year: int):
+    """Converte 'Dia' do PDF (ex: '3-5', '3 a 5', '3/5', '3') em (data_inicio, data_fim)."""
+    day_text = (day_text or "").strip().lower()
+    nums = [int(n) for n in re.findall(r"\d{1,2}", day_text)]
+    if not nums:
+        return None, None
+
+    d1 = min(nums)
+    d2 = max(nums)
+
+    def safe_date(d: int):
+        try:
+            return dt.date(year, month_num, d)
+        except Exception:
+            return None
+
+    start = safe_date(d1)
+    end = safe_date(d2)
+
+    if start and end and end < start:
+        end = start
+
+    return start, end
+
+
+# -------------------------------------------------
+# LEXER DE TOKENS (motor "tokens")
+# -------------------------------------------------
+# Uma única regex compilada etiqueta cada token; a ordem das alternativas é a prioridade.
+_TOKEN_RE = re.compile(
+    r"(?P<DIV>ABS|JOV)"
+    r"|(?P<TIPO>CIR|FPP|FOR|INT)"
+    r"|(?P<EURO>.*€.*)"
+    r"|(?P<MONEY>[´']?\d{1,3}(?:\.\d{3})*(?:,\d+)?)"
+    r"|(?P<CATEGORY>[FMS]\d{1,2}|VET|FIP)"
+    r"|(?P<A>[aA])"
+    r"|(?P<DEFINIR>(?i:definir).*)",
+    re.S,
+)
+
+
+@lru_cache(maxsize=8192)
+def token_tag(tok: str) -> str:
+    """DIV / TIPO / EURO / MONEY / CATEGORY / A / DEFINIR, ou WORD (memoizado: os tokens repetem-se muito)."""
+    m = _TOKEN_RE.fullmatch(tok)
+    return m.lastgroup if m else "WORD"
+
+
+def group_words_into_rows(words, y_tol=3):
+    """Agrupa as palavras de uma página em linhas pela coordenada 'top'.
+
+    Cada palavra entra na primeira linha (por ordem de criação) cuja média de 'top'
+    está a <= y_tol; senão abre uma linha nova.
+
+    Como as palavras são percorridas por 'top' crescente, a média de qualquer linha
+    nunca ultrapassa o 'top' actual: uma linha que já ficou mais de y_tol para trás
+    nunca mais recebe palavras e sai da janela activa (sweep-line). Cada palavra só
+    é comparada com as poucas linhas ainda activas — custo linear no nº de palavras,
+    com exactamente as mesmas linhas que a comparação contra todas as linhas.
+    """
+    rows = []
+    active = []
+    for w in sorted(words, key=lambda x: (x["top"], x["x0"])):
+        top = w["top"]
+        active = [r for r in active if top - r["y"] <= y_tol]
+
+        if active:
+            r = active[0]
+            r["words"].append(w)
+            r["y"] = (r["y"] * (len(r["words"]) - 1) + top) / len(r["words"])
+        else:
+            r = {"y": top, "words": [w]}
+            rows.append(r)
+            active.append(r)
+
+    for r in rows:
+        r["words"] = sorted(r["words"], key=lambda x: x["x0"])
+    return rows
+
+
+# -------------------------------------------------
+# CLASSIFICAÇÃO POR PÁGINA (independente do mês corrente)
+# -------------------------------------------------
+def parse_table_line(tokens, line_words, x_local, x_org):
+    """Parte os tokens de uma linha da tabela nos campos da linha (sem mês/datas).
+
+    Cada token é etiquetado uma vez (token_tag) e uma pequena máquina de estados
+    percorre as etiquetas: PRE (dia + tipo) até ao DIV, depois o resto até ao primeiro
+    "€", a registar o último valor de classe, os "A definir" e o início das categorias.
+    Devolve None se a linha não for uma actividade (sem DIV ABS/JOV).
+    """
+    tags = [token_tag(t) for t in tokens]
+
+    # PRE -> DIV
+    try:
+        div_idx = tags.index("DIV")
+    except ValueError:
+        return None
+    div = tokens[div_idx]
+
+    pre = tokens[:div_idx]
+    if len(pre) >= 2 and tags[div_idx - 2] == "TIPO":
+        day_text = " ".join(pre[:-2]).strip()
+    elif len(pre) >= 1 and tags[div_idx - 1] == "TIPO":
+        day_text = " ".join(pre[:-1]).strip()
+    else:
+        day_text = " ".join(pre).strip()
+
+    rest = tokens[div_idx + 1:]
+    rest_tags = tags[div_idx + 1:]
+    if not rest:
+        return None
+
+    # REST -> até ao primeiro "€" (nada depois dele conta para classe/categorias)
+    n = len(rest)
+    euro_idx = None
+    last_money = None
+    a_definir = []
+    cat_first = None
+    for i, tag in enumerate(rest_tags):
+        if tag == "EURO":
+            euro_idx = i
+            break
+        if tag == "MONEY":
+            last_money = i
+        elif tag == "A" and i + 1 < n and rest_tags[i + 1] == "DEFINIR":
+            a_definir.append(i)
+        if cat_first is None and (
+            tag == "CATEGORY"
+            or (rest[i] == "M" and i + 2 < n and rest[i + 1] == "&" and rest[i + 2] == "F")
+        ):
+            cat_first = i
+
+    class_end = euro_idx if euro_idx is not None else n
+    classe = ""
+    class_start = None
+
+    # "A definir" (só nos últimos 3 tokens antes do fim da classe)
+    for i in a_definir:
+        if i >= class_end - 3:
+            classe = "A definir"
+            class_start = i
+            break
+
+    # Valor de classe (último número antes do fim da classe)
+    if not classe and last_money is not None:
+        i = last_money
+        class_start = i
+        if i + 2 < class_end and rest[i + 1] == "/" and rest[i + 2][:1].isalpha():
+            classe = " ".join(rest[i:i + 3])
+        elif i + 1 < class_end and "/" in rest[i + 1]:
+            classe = " ".join(rest[i:i + 2])
+        else:
+            classe = rest[i]
+
+    if class_start is None:
+        class_start = class_end
+
+    # Categorias
+    cat_start = cat_first if cat_first is not None and cat_first < class_start else None
+
+    if cat_start is None:
+        actividade_tokens = rest[:class_start]
+        categorias_tokens = []
+    else:
+        actividade_tokens = rest[:cat_start]
+        categorias_tokens = rest[cat_start:class_start]
+
+    if actividade_tokens and actividade_tokens[-1] == "FPP":
+        actividade_tokens = actividade_tokens[:-1]
+
+    actividade = " ".join(actividade_tokens).strip()
+    categorias = " ".join(categorias_tokens).strip()
+
+    # Local / Organização por coordenadas
+    local_col = ""
+    org_col = ""
+    if x_local is not None and x_org is not None:
+        margin = 2.0
+        local_words = [
+            w["text"] for w in line_words
+            if (w["x0"] >= x_local - margin) and (w["x0"] < x_org - margin)
+        ]
+        org_words = [
+            w["text"] for w in line_words
+            if (w["x0"] >= x_org - margin)
+        ]
+        local_col = " ".join(local_words).strip()
+        org_col = " ".join(org_words).strip()
+        if local_col.upper() == "LOCAL":
+            local_col = ""
+        if org_col.upper().startswith("ORGAN"):
+            org_col = ""
+
+    return {
+        "Dia": day_text,
+        "DIV": div,
+        "Actividade": actividade,
+        "Categorias": categorias,
+        "Classe": classe,
+        "Local_pdf": local_col,
+        "Organizacao_pdf": org_col,
+    }
+
+
+def find_table_header(line_rows) -> dict | None:
+    """Linha de cabeçalho da tabela (MÊS ... DIV ... ACTIVIDADES ... LOCAL ... ORGANIZAÇÃO).
+
+    Devolve a bbox do cabeçalho, o x das colunas LOCAL/ORGAN e o x0 de cada coluna
+    reconhecida (HEADER_COLUMNS), ou None.
+    """
+    for lr in line_rows:
+        up = " ".join(w["text"] for w in lr["words"]).upper()
+        if not (("LOCAL" in up) and ("ORGAN" in up) and ("DIV" in up) and ("ACTIV" in up)):
+            continue
+
+        x_local = None
+        x_org = None
+        for w in lr["words"]:
+            t = w["text"].upper()
+            if t == "LOCAL":
+                x_local = w["x0"]
+            if t.startswith("ORGAN"):
+                x_org = w["x0"]
+        if x_local is None or x_org is None:
+            continue
+
+        columns = []
+        seen = set()
+        for w in lr["words"]:
+            t = w["text"].upper()
+            for prefix, field in HEADER_COLUMNS:
+                if t.startswith(prefix) and field not in seen:
+                    columns.append([field, w["x0"]])
+                    seen.add(field)
+                    break
+
+        return {
+            "x0": min(w["x0"] for w in lr["words"]),
+            "top": min(w["top"] for w in lr["words"]),
+            "bottom": max(w["bottom"] for w in lr["words"]),
+            "x_local": x_local,
+            "x_org": x_org,
+            "columns": sorted(columns, key=lambda c: c[1]),
+        }
+    return None
+
+
+def classify_lines_by_bands(line_rows, header: dict) -> list[tuple]:
+    """Motor "bands": cada palavra vai para a coluna cuja faixa de x a contém.
+
+    As faixas começam no x0 de cada título do cabeçalho (menos uma margem, como o
+    LOCAL/ORGAN do motor "tokens"); a coluna de todas as palavras da página é
+    calculada de uma vez (np.searchsorted) e cada linha é depois uma passagem linear.
+    """
+    names = [c[0] for c in header["columns"]]
+    edges = np.array([c[1] for c in header["columns"]], dtype=float) - 2.0
+
+    all_words = [w for lr in line_rows for w in lr["words"]]
+    if not all_words:
+        return []
+    x0s = np.fromiter((w["x0"] for w in all_words), dtype=float, count=len(all_words))
+    col_idx = np.clip(np.searchsorted(edges, x0s, side="right") - 1, 0, len(names) - 1).tolist()
+
+    out = []
+    pos = 0
+    for lr in line_rows:
+        n = len(lr["words"])
+        fields = {name: [] for name in names}
+        for w, c in zip(lr["words"], col_idx[pos:pos + n]):
+            fields[names[c]].append(w["text"])
+        pos += n
+
+        texts = [w["text"] for w in lr["words"]]
+        up = " ".join(texts).upper()
+        if not up.strip():
+            continue
+        if "MÊS" in up and "ACTIVIDADES" in up and "DIV" in up:
+            continue
+        if up.startswith("CALEND"):
+            continue
+
+        mes = fields.get("Mes") or []
+        if mes and mes[0].upper() in MONTH_SET:
+            out.append(("month", mes[0].upper()))
+
+        div = next((t for t in fields.get("DIV", []) if t in ("ABS", "JOV")), None)
+        if div is None:
+            continue
+
+        # como no parse_table_line: o "FPP" no fim da actividade é o organizador, não o nome
+        actividade = fields.get("Actividade", [])
+        if actividade and actividade[-1] == "FPP":
+            actividade = actividade[:-1]
+
+        classe = fields.get("Classe", [])
+        if any("€" in t for t in classe):
+            classe = classe[:next(i for i, t in enumerate(classe) if "€" in t)]
+
+        local_col = " ".join(fields.get("Local_pdf", [])).strip()
+        org_col = " ".join(fields.get("Organizacao_pdf", [])).strip()
+        if local_col.upper() == "LOCAL":
+            local_col = ""
+        if org_col.upper().startswith("ORGAN"):
+            org_col = ""
+
+        out.append(
+            (
+                "row",
+                {
+                    "Dia": " ".join(fields.get("Dia", [])).strip(),
+                    "DIV": div,
+                    "Actividade": " ".join(actividade).strip(),
+                    "Categorias": " ".join(fields.get("Categorias", [])).strip(),
+                    "Classe": " ".join(classe).strip(),
+                    "Local_pdf": local_col,
+                    "Organizacao_pdf": org_col,
+                },
+            )
+        )
+    return out
+
+
+def classify_page_words(words, header: dict | None = None, engine: str = "tokens") -> list[tuple]:
+    """Classifica as linhas de uma página em ("month", MES) e ("row", campos).
+
+    Não depende do mês das páginas anteriores; linhas antes do primeiro mês são
+    emitidas na mesma e descartadas no stitch_pages. Com 'header' (modo "table"),
+    usa o x das colunas já conhecido em vez de procurar o cabeçalho na página.
+    Com engine="bands" usa classify_lines_by_bands (se a página tiver cabeçalho).
+    """
+    if not words:
+        return []
+
+    line_rows = group_words_into_rows(words, y_tol=3)
+
+    if engine == "bands":
+        band_header = header if header is not None else find_table_header(line_rows)
+        if band_header is not None and band_header.get("columns"):
+            return classify_lines_by_bands(line_rows, band_header)
+
+    x_local = None
+    x_org = None
+    if header is not None:
+        x_local = header["x_local"]
+        x_org = header["x_org"]
+    else:
+        for lr in line_rows:
+            line_text = " ".join(w["text"] for w in lr["words"]).strip()
+            up = line_text.upper()
+            if ("LOCAL" in up) and ("ORGAN" in up) and ("DIV" in up) and ("ACTIV" in up):
+                for w in lr["words"]:
+                    t = w["text"].upper()
+                    if t == "LOCAL":
+                        x_local = w["x0"]
+                    if t.startswith("ORGAN"):
+                        x_org = w["x0"]
+
+    out = []
+    for lr in line_rows:
+        line_text = " ".join(w["text"] for w in lr["words"]).strip()
+        if not line_text:
+            continue
+
+        up = line_text.upper()
+        if "MÊS" in up and "ACTIVIDADES" in up and "DIV" in up:
+            continue
+        if up.startswith("CALEND"):
+            continue
+
+        tokens = line_text.split()
+        first = tokens[0].upper()
+        if first in MONTH_SET:
+            out.append(("month", first))
+            tokens = tokens[1:]
+            if not tokens:
+                continue
+
+        row = parse_table_line(tokens, lr["words"], x_local, x_org)
+        if row is not None:
+            out.append(("row", row))
+    return out
+
+
+def _open_pdf(pdf_source: str | bytes):
+    """Abre o PDF a partir do caminho do ficheiro em cache (lido por seek, sem cópia no heap)
+    ou, por compatibilidade, a partir dos bytes."""
+    if isinstance(pdf_source, (bytes, bytearray)):
+        return pdfplumber.open(BytesIO(pdf_source))
+    return pdfplumber.open(pdf_source)
+
+
+_LIT_IMAGE = LIT("Image")
+
+
+def _hash_pdf_object(h, obj, seen: dict) -> None:
+    """Serializa um objecto PDF (resolvido recursivamente) para o hash.
+
+    Entram os dicionários, listas, nomes e os dados dos streams (content streams de Form
+    XObjects, ToUnicode, Encoding, ficheiros de fontes...); os dados das imagens não
+    (não mudam o texto). Objectos indirectos já vistos entram pela ordem de visita, nunca
+    pelo objid, o que também corta ciclos.
+    """
+    if isinstance(obj, PDFObjRef):
+        if obj.objid in seen:
+            h.update(f"@{seen[obj.objid]};".encode("utf-8"))
+            return
+        seen[obj.objid] = len(seen)
+        obj = resolve1(obj)
+
+    if isinstance(obj, PDFStream):
+        h.update(b"stream<")
+        _hash_pdf_object(h, obj.attrs, seen)
+        if obj.attrs.get("Subtype") is not _LIT_IMAGE:
+            h.update(obj.get_data())
+        h.update(b">")
+    elif isinstance(obj, dict):
+        h.update(b"{")
+        for key in sorted(obj):
+            h.update(f"{key}=".encode("utf-8"))
+            _hash_pdf_object(h, obj[key], seen)
+        h.update(b"}")
+    elif isinstance(obj, (list, tuple)):
+        h.update(b"[")
+        for item in obj:
+            _hash_pdf_object(h, item, seen)
+        h.update(b"]")
+    elif isinstance(obj, bytes):
+        h.update(repr(obj).encode("utf-8"))
+    else:
+        h.update(f"{type(obj).__name__}:{obj!r};".encode("utf-8"))
+
+
+def page_fingerprint(page) -> str | None:
+    """Hash da página sem extrair palavras: geometria, content streams e todos os recursos.
+
+    Os recursos entram recursivamente (Form XObjects e os seus recursos, fontes com
+    Encoding/ToUnicode), porque o texto pode estar desenhado dentro de um XObject ou mudar
+    só pelo mapa de caracteres da fonte. Páginas que não mudaram entre revisões do PDF
+    têm o mesmo fingerprint (os objids internos do PDF não entram no hash). None se a
+    página não puder ser lida assim — e então não usa a cache.
+    """
+    try:
+        obj = page.page_obj
+        h = hashlib.sha256()
+        h.update(repr((tuple(page.bbox), page.rotation)).encode("utf-8"))
+
+        seen = {}
+        _hash_pdf_object(h, obj.resources, seen)
+        for stream in obj.contents:
+            _hash_pdf_object(h, stream, seen)
+        return h.hexdigest()
+    except Exception:
+        return None
+
+
+def _page_has_text_ops(page) -> bool:
+    """Verificação barata (sem layout do pdfminer): a página pode ter texto?
+
+    Procura operadores de texto no content stream da página; um XObject desenhado (Do)
+    também conta, porque o texto pode estar dentro de um Form XObject.
+    """
+    try:
+        return any(
+            op in resolve1(stream).get_data()
+            for stream in page.page_obj.contents
+            for op in (b"Tj", b"TJ", b"'", b'"', b"Do")
+        )
+    except Exception:
+        return True
+
+
+def classify_table_page(page, header: dict, engine: str = "tokens") -> list[tuple]:
+    """Modo "table": páginas sem texto nem chegam ao pdfminer; nas restantes só contam
+    as palavras da região da tabela (abaixo do cabeçalho, se a página o repetir), com o
+    x das colunas vindo do cabeçalho detectado uma vez.
+
+    O pdfplumber interpreta sempre a página inteira, por isso o recorte é feito sobre as
+    palavras (mais barato do que page.within_bbox, que copia todos os objectos).
+    """
+    if not _page_has_text_ops(page):
+        return []
+
+    words = page.extract_words(use_text_flow=True) or []
+    if not words:
+        return []
+
+    # o cabeçalho repete-se na mesma posição em todas as páginas do template
+    band = " ".join(
+        w["text"] for w in words
+        if header["top"] - 3 <= w["top"] <= header["bottom"] + 3
+    ).upper()
+    top = header["bottom"] if ("LOCAL" in band and "ORGAN" in band) else 0
+    x_min = header["x0"] - 5
+
+    words = [w for w in words if w["top"] >= top and w["x0"] >= x_min]
+    return classify_page_words(words, header=header, engine=engine)
+
+
+def _detect_table_header(pdf, fingerprints: list[str | None]) -> dict | None:
+    """Procura o cabeçalho da tabela nas primeiras páginas (resultado em cache por página)."""
+    for page, fp in list(zip(pdf.pages, fingerprints))[:HEADER_SCAN_PAGES]:
+        cached = load_page_header(fp, PARSER_VERSION) if fp else None
+        if cached is not None:
+            header = cached["header"]
+        else:
+            header = None
+            if _page_has_text_ops(page):
+                words = page.extract_words(use_text_flow=True) or []
+                header = find_table_header(group_words_into_rows(words, y_tol=3))
+                page.close()
+            if fp:
+                store_page_header(fp, PARSER_VERSION, header)
+        if header is not None:
+            return header
+    return None
+
+
+def _classify_pages(
+    pdf_source: str | bytes,
+    page_numbers: list[int],
+    header: dict | None = None,
+    engine: str = "tokens",
+) -> list[list[tuple]]:
+    """Worker do process pool: abre o PDF uma vez e classifica um bloco de páginas.
+
+    Com um caminho de ficheiro, cada processo recebe só a string (não o PDF inteiro).
+    """
+    with _open_pdf(pdf_source) as pdf:
+        return [_classify_page(pdf.pages[n], header, engine) for n in page_numbers]
+
+
+def _classify_page(page, header: dict | None, engine: str) -> list[tuple]:
+    """Classifica uma página e liberta logo a cache de objectos do pdfplumber (chars, layout)."""
+    try:
+        if header is not None:
+            return classify_table_page(page, header, engine=engine)
+        words = page.extract_words(use_text_flow=True) or []
+        return classify_page_words(words, engine=engine)
+    finally:
+        page.close()
+
+
+def _entries_key(fingerprint: str | None, header: dict | None, engine: str) -> str | None:
+    """Chave da cache de páginas: no modo "table" as linhas dependem do cabeçalho partilhado
+    e, em qualquer modo, do motor (o caso por omissão mantém o fingerprint puro)."""
+    if not fingerprint:
+        return None
+    if header is None and engine == "tokens":
+        return fingerprint
+    suffix = json.dumps([engine, header], sort_keys=True)
+    return hashlib.sha256(f"{fingerprint}|{suffix}".encode("utf-8")).hexdigest()
+
+
+_EPOCH_ORDINAL = dt.date(1970, 1, 1).toordinal()
+_NAT = np.iinfo(np.int64).min  # representação inteira de NaT em datetime64
+
+
+def _dedupe_text(text: str) -> str:
+    """Texto para a chave de dedupe: espaços colapsados, sem pontas, minúsculas."""
+    return " ".join(text.split()).lower()
+
+
+class CalendarColumns:
+    """Acumulador colunar das linhas do calendário: uma lista/array por coluna, sem dict por linha.
+
+    É a única etapa de dedupe do calendário: linhas repetidas são ignoradas logo no append,
+    comparando DIV, datas e os campos de texto sem maiúsculas nem diferenças de espaços
+    (fica a primeira pela ordem do PDF; 'seen' pode ser partilhado entre acumuladores,
+    p.ex. um por página no streaming). to_frame() constrói o DataFrame uma única vez, já
+    ordenado (Data_Inicio, DIV, Actividade), com datas em datetime64 e Mes/DIV categóricos.
+    """
+
+    # campos de texto que entram na chave de dedupe (normalizados por _dedupe_text)
+    KEY_FIELDS = ("Actividade", "Categorias", "Classe", "Local_pdf", "Organizacao_pdf")
+
+    _COLUMNS = (
+        "month", "dia", "div", "actividade", "categorias", "classe",
+        "local", "org", "start", "end",
+    )
+    __slots__ = _COLUMNS + ("_seen",)
+
+    DIVS = ["ABS", "JOV"]
+
+    def __init__(self, seen: set | None = None):
+        self.month = array("b")
+        self.dia = []
+        self.div = array("b")
+        self.actividade = []
+        self.categorias = []
+        self.classe = []
+        self.local = []
+        self.org = []
+        self.start = array("q")
+        self.end = array("q")
+        self._seen = set() if seen is None else seen
+
+    def __len__(self) -> int:
+        return len(self.dia)
+
+    def append(self, month_num: int, fields: dict, start_date, end_date) -> None:
+        start = start_date.toordinal() - _EPOCH_ORDINAL if start_date else _NAT
+        end = end_date.toordinal() - _EPOCH_ORDINAL if end_date else _NAT
+        key = (fields["DIV"], start, end) + tuple(_dedupe_text(fields[f]) for f in self.KEY_FIELDS)
+        if key in self._seen:
+            return
+        self._seen.add(key)
+
+        self.month.append(month_num - 1)
+        self.dia.append(fields["Dia"])
+        self.div.append(self.DIVS.index(fields["DIV"]))
+        self.actividade.append(fields["Actividade"])
+        self.categorias.append(fields["Categorias"])
+        self.classe.append(fields["Classe"])
+        self.local.append(fields["Local_pdf"])
+        self.org.append(fields["Organizacao_pdf"])
+        self.start.append(start)
+        self.end.append(end)
+
+    def extend(self, other: "CalendarColumns") -> None:
+        """Acrescenta as linhas de outro acumulador (já filtradas pelo mesmo 'seen')."""
+        for name in self._COLUMNS:
+            getattr(self, name).extend(getattr(other, name))
+
+    def to_frame(self) -> pd.DataFrame:
+        start = np.frombuffer(self.start, dtype=np.int64)
+        end = np.frombuffer(self.end, dtype=np.int64)
+        div = np.frombuffer(self.div, dtype=np.int8)
+        month = np.frombuffer(self.month, dtype=np.int8)
+
+        # lexsort é estável: a última chave é a principal; datas em falta vão para o fim
+        order = np.lexsort(
+            (
+                np.array(self.actividade, dtype=str),
+                div,
+                np.where(start == _NAT, np.iinfo(np.int64).max, start),
+            )
+        )
+
+        def take(values: list) -> list:
+            return [values[i] for i in order]
+
+        month_titles = [m.title() for m in MONTHS]
+        month = month[order]
+        dia = take(self.dia)
+        return pd.DataFrame(
+            {
+                "Mes": pd.Categorical.from_codes(month, categories=month_titles, ordered=True),
+                "Dia": dia,
+                "DIV": pd.Categorical.from_codes(div[order], categories=self.DIVS),
+                "Actividade": take(self.actividade),
+                "Categorias": take(self.categorias),
+                "Classe": take(self.classe),
+                "Local_pdf": take(self.local),
+                "Organizacao_pdf": take(self.org),
+                "Data_Inicio": start[order].view("datetime64[D]").astype("datetime64[ns]"),
+                "Data_Fim": end[order].view("datetime64[D]").astype("datetime64[ns]"),
+                "Data (mês + dia)": [f"{month_titles[m]} {d}" for m, d in zip(month.tolist(), dia)],
+            }
+        )
+
+
+def _stitch_entries(entries: list[tuple], year: int, month_num: int | None, cols: CalendarColumns) -> int | None:
+    """Acrescenta as linhas de uma página a 'cols'; devolve o mês corrente no fim da página."""
+    for kind, value in entries:
+        if kind == "month":
+            month_num = MONTH_TO_NUM[value.title()]
+            continue
+        if not month_num:
+            continue
+
+        start_date, end_date = parse_day_range_to_dates(value["Dia"], month_num, year)
+        cols.append(month_num, value, start_date, end_date)
+    return month_num
+
+
+def stitch_pages(pages, year: int) -> CalendarColumns:
+    """Passagem sequencial: propaga o mês corrente entre páginas e calcula as datas."""
+    cols = CalendarColumns()
+    month_num = None
+    for entries in pages:
+        month_num = _stitch_entries(entries, year, month_num, cols)
+    return cols
+
+
+def _iter_classified(
+    pdf_source: str | bytes,
+    page_numbers: list[int],
+    workers: int,
+    header: dict | None = None,
+    engine: str = "tokens",
+):
+    """(n, entradas) de cada página pedida, pela ordem; em paralelo se workers > 1.
+
+    No pool, as páginas vão em blocos contíguos (cada processo abre o PDF uma vez por
+    bloco) e o map devolve-os pela ordem do PDF, à medida que ficam prontos. Se o pool
+    falhar, as páginas que faltam são classificadas aqui, em sequência.
+    """
+    done = 0
+    workers = min(workers, len(page_numbers))
+    if workers > 1:
+        size = -(-len(page_numbers) // (workers * 2))
+        blocks = [page_numbers[i:i + size] for i in range(0, len(page_numbers), size)]
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=_MP_CONTEXT) as ex:
+                results = ex.map(_classify_pages, repeat(pdf_source), blocks, repeat(header), repeat(engine))
+                for block, pages in zip(blocks, results):
+                    for item in zip(block, pages):
+                        yield item
+                        done += 1
+        except Exception:
+            pass
+        else:
+            return
+
+    with _open_pdf(pdf_source) as pdf:
+        for n in page_numbers[done:]:
+            yield n, _classify_page(pdf.pages[n], header, engine)
+
+
+def iter_page_entries(
+    pdf_source: str | bytes,
+    workers: int | None = None,
+    use_page_cache: bool = True,
+    mode: str | None = None,
+    engine: str | None = None,
+):
+    """Entradas classificadas de cada página (ver classify_page_words), pela ordem do PDF.
+
+    Páginas já vistas (mesmo fingerprint, noutra revisão do PDF) vêm da cache em disco;
+    só as restantes são extraídas, em paralelo se workers > 1, e guardadas na cache.
+    'mode' escolhe a extracção ("page" ou "table", ver PARSE_MODE) e 'engine' o motor
+    que parte as linhas ("tokens" ou "bands", ver PARSE_ENGINE).
+    """
+    workers = PARSE_WORKERS if workers is None else workers
+    mode = PARSE_MODE if mode is None else mode
+    engine = PARSE_ENGINE if engine is None else engine
+
+    header = None
+    with _open_pdf(pdf_source) as pdf:
+        fingerprints = [page_fingerprint(page) if use_page_cache else None for page in pdf.pages]
+        if mode == "table":
+            header = _detect_table_header(pdf, fingerprints)
+
+    keys = [_entries_key(fp, header, engine) for fp in fingerprints]
+    pages = [load_page_entries(k, PARSER_VERSION) if k else None for k in keys]
+    todo = [n for n, entries in enumerate(pages) if entries is None]
+
+    classified = _iter_classified(pdf_source, todo, workers, header, engine)
+    try:
+        for n, entries in enumerate(pages):
+            if entries is None:
+                _, entries = next(classified)
+                if keys[n]:
+                    store_page_entries(keys[n], PARSER_VERSION, entries)
+            yield entries
+    finally:
+        # fecha o pool logo a seguir à última página (ou se o consumidor parar a meio)
+        classified.close()
+
+
+def parse_calendar_columns(
+    pdf_source: str | bytes,
+    year: int,
+    workers: int | None = None,
+    use_page_cache: bool = True,
+    mode: str | None = None,
+    engine: str | None = None,
+) -> CalendarColumns:
+    """Linhas do calendário, em colunas (CalendarColumns); ver iter_page_entries."""
+    return stitch_pages(iter_page_entries(pdf_source, workers, use_page_cache, mode, engine), year)
+
+
+def iter_calendar_frames(
+    pdf_source: str | bytes,
+    year: int,
+    into: CalendarColumns | None = None,
+    workers: int | None = None,
+    use_page_cache: bool = True,
+    mode: str | None = None,
+    engine: str | None = None,
+):
+    """Versão em streaming do parse: um DataFrame por página (na ordem do PDF).
+
+    Cada frame só tem as linhas novas dessa página (sem repetidos das anteriores),
+    ordenadas dentro da página. Com 'into', as mesmas linhas vão também para esse
+    acumulador: no fim, into.to_frame() é o resultado do parse_calendar_columns, sem
+    segunda passagem pelo PDF. A extracção é a do iter_page_entries (pool e cache de
+    páginas incluídos); a cache de objectos de cada página é libertada logo a seguir.
+    """
+    seen = set() if into is None else into._seen
+    month_num = None
+    for entries in iter_page_entries(pdf_source, workers, use_page_cache, mode, engine):
+        cols = CalendarColumns(seen)
+        month_num = _stitch_entries(entries, year, month_num, cols)
+        if into is not None:
+            into.extend(cols)
+        if len(cols):
+            yield cols.to_frame()
@@ -2,141 +2,213 @@ from __future__ import annotations
 
 import os
 import re
+import html
 import datetime as dt
 from urllib.parse import urlparse, quote_plus
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 
+from modules.calendar_index import DIV_ALL, CalendarQuery, build_calendar_metrics
+from modules.gazetteer import PLACE_KINDS, find_place, match_kinds
 
 
-def _clean_text(x) -> str:
-    s = "" if x is None else str(x)
-    s = re.sub(r"\s+", " ", s).strip()
-    return s
+
+# Texto com o motor de regex do Python (\b e \s com Unicode, como "Évora" ou NBSP),
+# e não o RE2 do pyarrow que o dtype "string" usa por omissão quando está instalado.
+TEXT_DTYPE = pd.StringDtype("python")
+
+
+def clean_text_col(s: pd.Series) -> pd.Series:
+    """Texto limpo (espaços colapsados, sem pontas); NA vira ""."""
+    return s.astype(TEXT_DTYPE).fillna("").str.replace(r"\s+", " ", regex=True).str.strip()
+
+
+def _is_text_col(s: pd.Series) -> bool:
+    return (
+        s.dtype == object
+        or pd.api.types.is_string_dtype(s.dtype)
+        or isinstance(s.dtype, pd.CategoricalDtype)
+    )
 
 
 MONTHS_PT = {
     "janeiro","fevereiro","março","marco","abril","maio","junho","julho","agosto","setembro","outubro","novembro","dezembro"
 }
 
-def _is_month_only(s: str) -> bool:
-    if not s:
-        return False
-    t = s.strip().lower()
-    return t in MONTHS_PT
+def _is_month_only(s: pd.Series) -> pd.Series:
+    return s.str.strip().str.lower().isin(MONTHS_PT)
 
 
-
-def _extract_local_from_text(txt: str) -> str:
-    s = _clean_text(txt)
-    if not s:
-        return ""
+def _extract_local_from_text(txt: pd.Series) -> pd.Series:
+    s = clean_text_col(txt)
     # Padrão típico: "FIP Bronze Portimão FPP ..." / "FIP Silver Lisboa FPP ..."
-    m = re.search(r"\bFIP\s+(?:Bronze|Silver|Gold|Platinum)\s+([A-Za-zÀ-ÿ][A-Za-zÀ-ÿ\- ]{2,60})\b", s, re.I)
-    if m:
-        cand = _clean_text(m.group(1))
-        # corta se vier com "FPP" ou classes coladas
-        cand = re.split(r"\bFPP\b|\bF\d\b|\bM\d\b|\bFIP\b", cand, flags=re.I)[0]
-        cand = _clean_text(cand)
-        cand = re.sub(r"^(Bronze|Silver|Gold|Platinum)\s+", "", cand, flags=re.I).strip()
-        if cand and not _is_month_only(cand):
-            return cand
-
-    # Se houver uma cidade conhecida dentro do texto, usa-a
-    cities = [
-        "Portimão","Portimao","Lisboa","Porto","Braga","Setúbal","Setubal","Faro","Coimbra","Aveiro","Leiria",
-        "Viseu","Évora","Evora","Guimarães","Guimaraes","Cascais","Sintra","Albufeira","Loulé","Loule",
-        "Olhão","Olhao","Tavira","Lagos","Ericeira","Matosinhos"
-    ]
-    for c in cities:
-        if re.search(rf"\b{re.escape(c)}\b", s, re.I):
-            return c
-    return ""
-
-
-def _pick_first(row, cols):
-    for c in cols:
-        if c in row and pd.notna(row[c]):
-            v = _clean_text(row[c])
-            if v:
-                return v
-    return ""
-
-def _infer_local(row, build_local_dash_org):
-    """Tenta construir 'Local' de forma robusta.
-    1) Usa a função original build_local_dash_org(row)
+    cand = clean_text_col(
+        s.str.extract(
+            r"\bFIP\s+(?:Bronze|Silver|Gold|Platinum)\s+([A-Za-zÀ-ÿ][A-Za-zÀ-ÿ\- ]{2,60})\b",
+            flags=re.IGNORECASE,
+        )[0]
+    )
+    # corta se vier com "FPP" ou classes coladas
+    cand = clean_text_col(cand.str.split(r"(?i)\bFPP\b|\bF\d\b|\bM\d\b|\bFIP\b", n=1, regex=True).str[0])
+    cand = cand.str.replace(r"^(Bronze|Silver|Gold|Platinum)\s+", "", case=False, regex=True).str.strip()
+    out = cand.where((cand != "") & ~_is_month_only(cand), "")
+
+    # Se houver um local do gazetteer dentro do texto, usa-o (só nas linhas ainda sem local)
+    todo = (out == "").to_numpy()
+    if todo.any():
+        out.loc[todo] = [find_place(x) for x in s[todo].tolist()]
+    return out
+
+
+# Colunas mais comuns (variam conforme o PDF)
+LOCAL_PREFERRED_COLS = [
+    "Local", "Localidade", "LOCAL", "Local (Org)",
+    "Clube", "Clube / Organização", "Clube/Organização", "Organização", "Organizacao", "Org", "ORGANIZAÇÃO",
+    "Cidade", "Concelho", "Distrito",
+    "Pavilhão", "Pavilhao", "Complexo", "Campo",
+]
+LOCAL_TEXT_COLS = ("Categorias", "Categoria", "Actividade", "Atividade", "Evento", "Prova", "Classe")
+LOCAL_SUFFIX_COLS = ("Categorias", "Classe")
+# Evitar confundir mês (da coluna Data/Local) com um local real
+LOCAL_SKIP_COLS = ("data (mês + dia)", "data", "mes", "mês")
+
+
+def _score_candidates(best: pd.Series, rows: pd.DataFrame) -> pd.Series:
+    """Fallback final: varrer todos os campos de texto por um candidato plausível
+    (evita datas e siglas curtas). Coluna a coluna, com as mesmas regras de pontuação."""
+    for c in rows.columns:
+        if str(c).strip().lower() in LOCAL_SKIP_COLS or not _is_text_col(rows[c]):
+            continue
+        s = clean_text_col(rows[c])
+        n = s.str.len()
+        ok = (
+            (n >= 4)
+            & ~_is_month_only(s)
+            & ~s.str.fullmatch(r"\d{1,2}\s*a\s*\d{1,2}$")
+            & ~s.str.fullmatch(r"\d{1,2}[/-]\d{1,2}(?:\s*a\s*\d{1,2}[/-]\d{1,2})?")
+        )
+        # preferir strings com letras e eventualmente parêntesis (clubes)
+        kinds = [match_kinds(x) for x in s.tolist()]
+        score = (
+            2 * s.str.contains(r"[A-Za-zÀ-ÿ]", regex=True).astype(int)
+            + 3 * pd.Series([not k.isdisjoint(PLACE_KINDS) for k in kinds], index=s.index, dtype=int)
+            + 2 * pd.Series(["club" in k for k in kinds], index=s.index, dtype=int)
+            + (n <= 80).astype(int)
+        )
+        # escolhe o de melhor score e mais curto
+        empty = best == ""
+        take = ok & (score > 0) & (empty | ((score > 4) & (n < best.str.len())) | ((score > 4) & ~empty & (score > 5)))
+        best = best.mask(take.astype(bool), s)
+    return best
+
+
+def _resolve_local(df: pd.DataFrame, build_local_dash_org) -> pd.Series:
+    """Tenta construir 'Local' de forma robusta, coluna a coluna.
+    1) Usa a função original build_local_dash_org(df)
     2) Fallback: tenta colunas comuns que podem ter mudado no PDF
-    3) Fallback final: procura em todas as colunas string por algo que pareça local
+    3) Extrai o local do texto (ex: "FIP Bronze Portimão FPP ...")
+    4) Sufixo depois de " - " em 'Categorias' / 'Classe'
+    5) Fallback final: procura nas colunas de texto por algo que pareça local
+    Cada nível só olha para as linhas que os anteriores não resolveram.
     """
+    local = pd.Series("", index=df.index, dtype=TEXT_DTYPE)
+    todo = np.ones(len(df), dtype=bool)
+
+    def settle(cand: pd.Series, ok: pd.Series):
+        ok = ok.to_numpy(dtype=bool)
+        idx = cand.index[ok]
+        local.loc[idx] = cand[ok]
+        todo[df.index.get_indexer(idx)] = False
+
     try:
-        v = build_local_dash_org(row)
-        v = _clean_text(v)
-        if v and not _is_month_only(v):
-            return v
+        rows = df[todo]
+        v = clean_text_col(build_local_dash_org(rows))
+        settle(v, (v != "") & ~_is_month_only(v))
     except Exception:
         pass
 
-    # Colunas mais comuns (variam conforme o PDF)
-    preferred = [
-        "Local", "Localidade", "LOCAL", "Local (Org)",
-        "Clube", "Clube / Organização", "Clube/Organização", "Organização", "Organizacao", "Org", "ORGANIZAÇÃO",
-        "Cidade", "Concelho", "Distrito",
-        "Pavilhão", "Pavilhao", "Complexo", "Campo",
-    ]
-    v = _pick_first(row, preferred)
-    if v and not _is_month_only(v):
-        return v
+    preferred = [c for c in LOCAL_PREFERRED_COLS if c in df.columns]
+    if preferred and todo.any():
+        rows = df[todo]
+        v = pd.Series("", index=rows.index, dtype=TEXT_DTYPE)
+        for c in preferred:
+            v = v.where(v != "", clean_text_col(rows[c]))
+        settle(v, (v != "") & ~_is_month_only(v))
 
-    # Tentar extrair local a partir de texto (ex: "FIP Bronze Portimão FPP ...")
-    for c in ("Categorias", "Categoria", "Actividade", "Atividade", "Evento", "Prova", "Classe"):
-        if c in row and pd.notna(row[c]):
-            cand = _extract_local_from_text(row[c])
-            if cand:
-                return cand
+    for c in LOCAL_TEXT_COLS:
+        if c in df.columns and todo.any():
+            cand = _extract_local_from_text(df.loc[todo, c])
+            settle(cand, cand != "")
 
     # Algumas vezes o local vem dentro de 'Categorias' ou 'Classe' (ex: "... — Lisboa")
-    for c in ("Categorias", "Classe"):
-        if c in row and pd.notna(row[c]):
-            txt = _clean_text(row[c])
+    for c in LOCAL_SUFFIX_COLS:
+        if c in df.columns and todo.any():
+            txt = clean_text_col(df.loc[todo, c])
             # captura um sufixo depois de " - " / " — " / " | "
-            m = re.search(r"(?:\s[-—|]\s)([^-—|]{3,60})$", txt)
-            if m:
-                cand = _clean_text(m.group(1))
-                if cand:
-                    return cand
-
-    # Fallback final: varrer todos os campos por um candidato plausível
-    # (evita datas e siglas curtas)
-    best = ""
-    for c, val in row.items():
-        # Evitar confundir mês (da coluna Data/Local) com um local real
-        if str(c).strip().lower() in ("data (mês + dia)", "data", "mes", "mês"):
-            continue
-        if val is None or (isinstance(val, float) and pd.isna(val)):
-            continue
-        s = _clean_text(val)
-        if not s:
-            continue
-        if _is_month_only(s):
-            continue
-        if len(s) < 4:
-            continue
-        if re.fullmatch(r"\d{1,2}\s*a\s*\d{1,2}$", s):
-            continue
-        if re.fullmatch(r"\d{1,2}[/-]\d{1,2}(?:\s*a\s*\d{1,2}[/-]\d{1,2})?", s):
-            continue
-        # preferir strings com letras e eventualmente parêntesis (clubes)
-        score = 0
-        if re.search(r"[A-Za-zÀ-ÿ]", s): score += 2
-        if re.search(r"\b(Lisboa|Porto|Braga|Setúbal|Faro|Madeira|Açores|Coimbra|Aveiro|Leiria)\b", s, re.I): score += 3
-        if re.search(r"\b(CP|Clube|Padel|Padel Club|CT|Associação|Associacao)\b", s, re.I): score += 2
-        if len(s) <= 80: score += 1
-        if score > 0 and score >= (0 if not best else -1):
-            # escolhe o de melhor score e mais curto
-            if (not best) or (score > 4 and len(s) < len(best)) or (score > 4 and best and score > 5):
-                best = s
-    return best
+            cand = clean_text_col(txt.str.extract(r"(?:\s[-—|]\s)([^-—|]{3,60})$")[0])
+            settle(cand, cand != "")
+
+    if todo.any():
+        rows = df[todo]
+        best = _score_candidates(pd.Series("", index=rows.index, dtype=TEXT_DTYPE), rows)
+        settle(best, best != "")
+
+    return local
+
+
+# Colunas que determinam o 'Local' de uma linha (chave da memo).
+# Mudar as regras acima => subir LOCAL_RESOLVER_VERSION (invalida a memo em disco).
+LOCAL_KEY_COLS = ["Local_pdf", "Organizacao_pdf", "Actividade", "Categorias", "Classe"]
+LOCAL_RESOLVER_VERSION = "3"
+_KEY_SEP = "\x1f"
+
+
+def infer_local_column(df: pd.DataFrame, build_local_dash_org, memo: dict | None = None) -> pd.Series:
+    """'Local' por linha, resolvido uma vez por combinação distinta das colunas-chave.
+
+    memo (chave -> local) é actualizada no lugar: combinações já vistas (reruns, revisões
+    anteriores do PDF) não voltam a passar pelos fallbacks.
+    """
+    if memo is None:
+        memo = {}
+
+    cols = [c for c in dict.fromkeys(LOCAL_KEY_COLS + LOCAL_PREFERRED_COLS + list(LOCAL_TEXT_COLS)) if c in df.columns]
+    keys_df = pd.DataFrame({c: clean_text_col(df[c]) for c in cols}, index=df.index)
+
+    key = pd.Series("", index=df.index, dtype=TEXT_DTYPE)
+    for i, c in enumerate(cols):
+        key = keys_df[c] if i == 0 else key + _KEY_SEP + keys_df[c]
+
+    codes, uniques = pd.factorize(key)
+    uniques = np.asarray(uniques, dtype=object)
+    _, first_pos = np.unique(codes, return_index=True)
+
+    new = np.array([i for i, u in enumerate(uniques) if u not in memo], dtype=int)
+    if len(new):
+        resolved = _resolve_local(keys_df.iloc[first_pos[new]], build_local_dash_org)
+        memo.update(zip(uniques[new], resolved.tolist()))
+
+    values = np.array([memo[u] for u in uniques], dtype=object)
+    return pd.Series(values[codes] if len(codes) else [], index=df.index, dtype=TEXT_DTYPE)
+
+
+def add_local_columns(df: pd.DataFrame, build_local_dash_org, memo: dict | None = None) -> pd.DataFrame:
+    """Acrescenta 'Local' (NA se vazio) e 'Mapa' ao frame."""
+    df["Local"] = clean_text_col(infer_local_column(df, build_local_dash_org, memo)).replace({"": pd.NA})
+    df["Mapa"] = maps_url_column(df["Local"])
+    return df
+
+
+def maps_url_column(local: pd.Series) -> pd.Series:
+    """URL do Google Maps por linha; quote_plus só uma vez por local distinto."""
+    codes, uniques = pd.factorize(local.astype(str))
+    urls = np.array(
+        [f"https://www.google.com/maps/search/?api=1&query={quote_plus(u)}" for u in uniques],
+        dtype=object,
+    )
+    return pd.Series(urls[codes] if len(codes) else [], index=local.index, dtype=object)
 
 
 def _repair_cross_month_from_text(df: pd.DataFrame, year: int) -> pd.DataFrame:
@@ -188,13 +260,90 @@ def _repair_cross_month_from_text(df: pd.DataFrame, year: int) -> pd.DataFrame:
     return df
 
 
+def normalize_calendar_dates(df: pd.DataFrame, year: int) -> pd.DataFrame:
+    """Datas finais (datetime64), calculadas uma vez quando o calendário é carregado.
+
+    Preenche Data_Inicio/Data_Fim uma com a outra, repara eventos que atravessam meses
+    (texto "a 1/03") e corrige Data_Fim antes do início (31/01 a 02/02 lido como 02/01).
+    As views depois só filtram.
+    """
+    if df is None or df.empty:
+        return df
+
+    df["Data_Inicio"] = pd.to_datetime(df["Data_Inicio"], errors="coerce")
+    df["Data_Fim"] = pd.to_datetime(df["Data_Fim"], errors="coerce")
+    df["Data_Fim"] = df["Data_Fim"].fillna(df["Data_Inicio"])
+    df["Data_Inicio"] = df["Data_Inicio"].fillna(df["Data_Fim"])
+
+    # reparar cross-month quando o parser falhou (usando texto)
+    df = _repair_cross_month_from_text(df, year=year)
+
+    # caso Data_Fim tenha ficado antes (31/01 a 02/02 interpretado como 02/01)
+    mask = df["Data_Inicio"].notna() & df["Data_Fim"].notna() & (df["Data_Fim"] < df["Data_Inicio"])
+    df.loc[mask, "Data_Fim"] = df.loc[mask, "Data_Fim"] + pd.DateOffset(months=1)
+    return df
+
+
+# =================================================
+# CARTÕES (mobile)
+# =================================================
+
+CARDS_PAGE_SIZE = 30
+
+CARD_TEMPLATE = (
+    '<div class="card">'
+    '<div class="title">{title}</div>'
+    '<div class="row">{date} &nbsp; <span class="pill">{div}</span></div>'
+    '<div class="row"><b>Classe:</b> {classe}</div>'
+    '<div class="row"><b>Local:</b> {local}</div>'
+    '<div class="actions"><a href="{maps}" target="_blank">Abrir no Maps →</a></div>'
+    "</div>"
+)
+
+
+def _escape_col(s: pd.Series) -> list[str]:
+    """html.escape por valor distinto; NA vira ""."""
+    values = s.astype(object).where(s.notna(), "")
+    escaped = {v: html.escape(str(v)) for v in pd.unique(values)}
+    return [escaped[v] for v in values]
+
+
+def render_cards_html(out: pd.DataFrame) -> str:
+    """Todos os cartões num só bloco HTML (valores escapados), para um único st.markdown."""
+    if out.empty:
+        return ""
+
+    cat, classe, local = _escape_col(out["Categorias"]), _escape_col(out["Classe"]), _escape_col(out["Local"])
+    cards = [
+        CARD_TEMPLATE.format(
+            title=c or k or l or "Evento",
+            date=d,
+            div=v,
+            classe=k,
+            local=l,
+            maps=m,
+        )
+        for c, k, l, d, v, m in zip(
+            cat, classe, local,
+            _escape_col(out["Data (mês + dia)"]), _escape_col(out["DIV"]), _escape_col(out["Mapa"]),
+        )
+    ]
+    return '<div class="cards">' + "".join(cards) + "</div>"
+
+
+def _show_more_cards(limit_key: str):
+    st.session_state[limit_key] = st.session_state.get(limit_key, CARDS_PAGE_SIZE) + CARDS_PAGE_SIZE
+
+
 def render_calendar(
     *,
     find_latest_calendar_pdf_url,
     infer_year_from_pdf_url,
-    download_pdf_bytes,
-    parse_calendar_pdf,
-    normalize_and_dedupe,
+    download_pdf_file,
+    load_calendar_df,
+    stream_calendar_pages,
+    load_calendar_metrics,
+    load_calendar_query,
     build_local_dash_org,
     month_sort_key,
     is_mobile: bool,
@@ -210,17 +359,34 @@ def render_calendar(
             pdf_url = find_latest_calendar_pdf_url()
             pdf_name = os.path.basename(urlparse(pdf_url).path)
             year = infer_year_from_pdf_url(pdf_url)
-            pdf_bytes = download_pdf_bytes(pdf_url)
+            pdf_ref = download_pdf_file(pdf_url)
+
+            # PDF novo: mostra os primeiros meses enquanto o resto ainda está a ser lido
+            preview = st.empty()
+            parts = []
+            for chunk in stream_calendar_pages(pdf_ref, year=year):
+                parts.append(chunk)
+                preview.dataframe(
+                    pd.concat(parts, ignore_index=True)[["Data (mês + dia)", "DIV", "Actividade", "Classe"]],
+                    use_container_width=True,
+                    hide_index=True,
+                )
+            preview.empty()
 
-            df = parse_calendar_pdf(pdf_bytes, year=year)
-            df = normalize_and_dedupe(df)
+            df = load_calendar_df(pdf_ref, year=year)
+            calendar_metrics = load_calendar_metrics(pdf_ref, year=year)
+            calendar_query = load_calendar_query(pdf_ref, year=year)
 
             st.session_state["df_ok"] = df
+            st.session_state["metrics_ok"] = calendar_metrics
+            st.session_state["query_ok"] = calendar_query
             st.session_state["pdf_url_ok"] = pdf_url
             st.session_state["pdf_name_ok"] = pdf_name
             st.session_state["year_ok"] = year
         except Exception:
             df = st.session_state.get("df_ok")
+            calendar_metrics = st.session_state.get("metrics_ok")
+            calendar_query = st.session_state.get("query_ok")
             pdf_url = st.session_state.get("pdf_url_ok", "")
             pdf_name = st.session_state.get("pdf_name_ok", "—")
             year = st.session_state.get("year_ok", dt.date.today().year)
@@ -254,35 +420,38 @@ def render_calendar(
         st.error("Não consegui extrair linhas do PDF (o formato pode ter mudado).")
         st.stop()
 
-    df["Local"] = df.apply(lambda r: _infer_local(r, build_local_dash_org), axis=1)
-    df["Local"] = (
-        df["Local"].astype("string")
-        .fillna("")
-        .str.replace(r"\s+", " ", regex=True)
-        .str.strip()
-        .replace({"": pd.NA})
+    # Normalmente já vem do load_calendar_df (com memo persistida); isto cobre frames antigos.
+    if "Local" not in df.columns or "Mapa" not in df.columns:
+        df = add_local_columns(df, build_local_dash_org)
+    if calendar_metrics is None:
+        calendar_metrics = build_calendar_metrics(df)
+    if calendar_query is None:
+        calendar_query = CalendarQuery(df)
+
+    # Só a divisão escolhida é calculada/desenhada (st.tabs corria as três views em cada rerun)
+    div_views = {"ABS": "ABS", "JOV": "JOV", "ABS + JOV": None}
+    div_label = st.radio(
+        "Divisão",
+        list(div_views),
+        key="calendar_div",
+        horizontal=True,
+        label_visibility="collapsed",
     )
 
-    df["Mapa"] = df["Local"].apply(
-        lambda x: f"https://www.google.com/maps/search/?api=1&query={quote_plus(str(x))}"
-    )
-
-    tab_abs, tab_jov, tab_all = st.tabs(["ABS", "JOV", "ABS + JOV"])
-
     def render_view(div_value: str | None):
         tab_key = (div_value or "ALL")
 
-        base = df.copy()
-        if div_value in ("ABS", "JOV"):
-            base = base[base["DIV"] == div_value].copy()
+        # Datas já normalizadas no load (normalize_calendar_dates): aqui só se filtra,
+        # por posições do CalendarQuery (sem copiar o frame)
+        div_sel = div_value if div_value in ("ABS", "JOV") else None
 
         # Filters (em form para não recalcular a cada clique)
         if is_mobile:
             with st.expander("Filtros", expanded=False):
                 with st.form(key=f"filtros_form_{tab_key}"):
-                    mes_opts = sorted(base["Mes"].unique(), key=month_sort_key)
+                    mes_opts = sorted(calendar_query.months(div_sel), key=month_sort_key)
                     mes_sel = st.selectbox("Mês", ["(Todos)"] + mes_opts, key=f"mes_{tab_key}")
-                    classes = sorted([c for c in base["Classe"].unique() if isinstance(c, str) and c.strip()])
+                    classes = sorted(calendar_query.classes(div_sel))
                     classe_sel = st.multiselect("Classe", classes, default=[], key=f"classe_{tab_key}")
                     quick = st.selectbox(
                         "Datas",
@@ -295,10 +464,10 @@ def render_calendar(
             with st.form(key=f"filtros_form_{tab_key}"):
                 c1, c2, c3, c4 = st.columns([1, 1, 1, 2])
                 with c1:
-                    mes_opts = sorted(base["Mes"].unique(), key=month_sort_key)
+                    mes_opts = sorted(calendar_query.months(div_sel), key=month_sort_key)
                     mes_sel = st.selectbox("Mês", ["(Todos)"] + mes_opts, key=f"mes_{tab_key}")
                 with c2:
-                    classes = sorted([c for c in base["Classe"].unique() if isinstance(c, str) and c.strip()])
+                    classes = sorted(calendar_query.classes(div_sel))
                     classe_sel = st.multiselect("Classe", classes, default=[], key=f"classe_{tab_key}")
                 with c3:
                     quick = st.selectbox(
@@ -310,28 +479,8 @@ def render_calendar(
                     search = st.text_input("Pesquisa", placeholder="Lisboa, FIP, S14, Madeira…", key=f"search_{tab_key}")
                 st.form_submit_button("Aplicar")
 
-        view = base.copy()
-
-        # garantir datas como datetime (para filtros funcionarem)
-        view["Data_Inicio"] = pd.to_datetime(view["Data_Inicio"], errors="coerce")
-        view["Data_Fim"] = pd.to_datetime(view["Data_Fim"], errors="coerce")
-        view["Data_Fim"] = view["Data_Fim"].fillna(view["Data_Inicio"])
-        view["Data_Inicio"] = view["Data_Inicio"].fillna(view["Data_Fim"])
-
-        # reparar cross-month quando o parser falhou (usando texto)
-        view = _repair_cross_month_from_text(view, year=year)
-
-        # caso Data_Fim tenha ficado antes (31/01 a 02/02 interpretado como 02/01)
-        maskv = view["Data_Inicio"].notna() & view["Data_Fim"].notna() & (view["Data_Fim"] < view["Data_Inicio"])
-        view.loc[maskv, "Data_Fim"] = view.loc[maskv, "Data_Fim"] + pd.DateOffset(months=1)
-
-        if mes_sel != "(Todos)":
-            view = view[view["Mes"] == mes_sel]
-
-        if classe_sel:
-            view = view[view["Classe"].isin(classe_sel)]
-
         today = dt.date.today()
+        start = end = None
         if quick != "(Nenhum)":
             if quick == "Este mês":
                 start = dt.date(today.year, today.month, 1)
@@ -343,57 +492,28 @@ def render_calendar(
                 start = today
                 end = today + dt.timedelta(days=30)
 
-            view = view[
-                (view["Data_Inicio"].notna())
-                & (view["Data_Fim"].notna())
-                & (view["Data_Inicio"].dt.date <= end)
-                & (view["Data_Fim"].dt.date >= start)
-            ]
-
-        if search.strip():
-            q = search.strip().lower()
-            cols = ["Data (mês + dia)", "DIV", "Categorias", "Classe", "Local", "Mes"]
-            mask = False
-            for col in cols:
-                mask = mask | view[col].astype(str).str.lower().str.contains(q, na=False)
-            view = view[mask]
-
-        # Ordenação cronológica (após filtros)
-        if "Data_Inicio" in view.columns:
-            view = view.sort_values(["Data_Inicio", "DIV", "Categorias"], na_position="last", kind="mergesort")
+        # Já vem por ordem cronológica (Data_Inicio, DIV, Categorias); a pesquisa ignora acentos
+        rows = calendar_query.select(
+            div=div_sel,
+            month=None if mes_sel == "(Todos)" else mes_sel,
+            classes=classe_sel,
+            start=start,
+            end=end,
+            search=search,
+        )
+        view = df.iloc[rows]
 
         # Metrics: total respeita filtros; "Este mês" e "Próximo" NÃO dependem do mês escolhido
         total = len(view)
 
-        metrics_df = base.copy()
-        metrics_df["Data_Inicio"] = pd.to_datetime(metrics_df["Data_Inicio"], errors="coerce")
-        metrics_df["Data_Fim"] = pd.to_datetime(metrics_df["Data_Fim"], errors="coerce")
-        metrics_df["Data_Fim"] = metrics_df["Data_Fim"].fillna(metrics_df["Data_Inicio"])
-        metrics_df["Data_Inicio"] = metrics_df["Data_Inicio"].fillna(metrics_df["Data_Fim"])
-
-        metrics_df = _repair_cross_month_from_text(metrics_df, year=year)
-
-        mask = metrics_df["Data_Inicio"].notna() & metrics_df["Data_Fim"].notna() & (metrics_df["Data_Fim"] < metrics_df["Data_Inicio"])
-        metrics_df.loc[mask, "Data_Fim"] = metrics_df.loc[mask, "Data_Fim"] + pd.DateOffset(months=1)
-
-        # Próximo evento
-        next_date = None
-        future = metrics_df[metrics_df["Data_Inicio"].notna() & (metrics_df["Data_Inicio"].dt.date >= today)]
-        if not future.empty:
-            future = future.sort_values(["Data_Inicio", "DIV", "Categorias"], na_position="last")
-            next_date = future.iloc[0]["Data_Inicio"]
+        # "Próximo" = pesquisa binária; "Este mês" = contagem de intervalos que se sobrepõem
+        metrics = calendar_metrics[div_value or DIV_ALL]
+        next_date = metrics.next_start(today)
 
         # Eventos a decorrer este mês (mês atual)
         start_month = dt.date(today.year, today.month, 1)
         end_month = (dt.date(today.year, today.month + 1, 1) - dt.timedelta(days=1)) if today.month != 12 else dt.date(today.year, 12, 31)
-
-        this_month = metrics_df[
-            metrics_df["Data_Inicio"].notna()
-            & metrics_df["Data_Fim"].notna()
-            & (metrics_df["Data_Inicio"].dt.date <= end_month)
-            & (metrics_df["Data_Fim"].dt.date >= start_month)
-        ]
-        this_month_count = len(this_month)
+        this_month_count = metrics.count_overlapping(start_month, end_month)
 
         m1, m2, m3 = st.columns(3)
         with m1:
@@ -438,23 +558,23 @@ def render_calendar(
         out = view[["Data (mês + dia)", "DIV", "Categorias", "Classe", "Local", "Mapa"]].copy()
 
         if is_mobile:
-            for _, row in out.iterrows():
-                title = row.get("Categorias") or row.get("Classe") or row.get("Local") or "Evento"
-                pills = f'<span class="pill">{row["DIV"]}</span>'
-
-                st.markdown(
-                    f"""
-                <div class="card">
-                  <div class="title">{title}</div>
-                  <div class="row">{row['Data (mês + dia)']} &nbsp; {pills}</div>
-                  <div class="row"><b>Classe:</b> {row['Classe']}</div>
-                  <div class="row"><b>Local:</b> {row['Local']}</div>
-                  <div class="actions">
-                    <a href="{row['Mapa']}" target="_blank">Abrir no Maps →</a>
-                  </div>
-                </div>
-                """,
-                    unsafe_allow_html=True,
+            # Um só elemento com os cartões visíveis; "Mostrar mais" alarga a janela
+            limit_key = f"cards_limit_{tab_key}"
+            filters_sig = (mes_sel, tuple(classe_sel), quick, search.strip())
+            if st.session_state.get(f"cards_sig_{tab_key}") != filters_sig:
+                st.session_state[f"cards_sig_{tab_key}"] = filters_sig
+                st.session_state[limit_key] = CARDS_PAGE_SIZE
+            limit = st.session_state.get(limit_key, CARDS_PAGE_SIZE)
+
+            st.markdown(render_cards_html(out.iloc[:limit]), unsafe_allow_html=True)
+
+            remaining = len(out) - limit
+            if remaining > 0:
+                st.button(
+                    f"Mostrar mais ({remaining} restantes)",
+                    key=f"more_{tab_key}",
+                    on_click=_show_more_cards,
+                    args=(limit_key,),
                 )
         else:
             st.dataframe(
@@ -473,9 +593,4 @@ def render_calendar(
             key=f"dl_{tab_key}",
         )
 
-    with tab_abs:
-        render_view("ABS")
-    with tab_jov:
-        render_view("JOV")
-    with tab_all:
-        render_view(None)
+    render_view(div_views[div_label])
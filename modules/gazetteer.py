@@ -0,0 +1,294 @@
+"""Gazetteer offline de locais portugueses (concelhos, ilhas, localidades, regiões, clubes).
+
+Todos os nomes (e aliases) são dobrados — minúsculas, sem acentos — e compilados uma vez
+por processo num autómato Aho-Corasick. Procurar locais num texto é uma só passagem pela
+string, qualquer que seja o tamanho do gazetteer.
+"""
+from __future__ import annotations
+
+import unicodedata
+from collections import deque
+from functools import lru_cache
+from typing import NamedTuple
+
+
+# =================================================
+# DADOS
+# =================================================
+
+# Os 308 concelhos (18 distritos + Madeira + Açores)
+MUNICIPALITIES = (
+    # Aveiro
+    "Águeda", "Albergaria-a-Velha", "Anadia", "Arouca", "Aveiro", "Castelo de Paiva", "Espinho",
+    "Estarreja", "Ílhavo", "Mealhada", "Murtosa", "Oliveira de Azeméis", "Oliveira do Bairro", "Ovar",
+    "Santa Maria da Feira", "São João da Madeira", "Sever do Vouga", "Vagos", "Vale de Cambra",
+    # Beja
+    "Aljustrel", "Almodôvar", "Alvito", "Barrancos", "Beja", "Castro Verde", "Cuba",
+    "Ferreira do Alentejo", "Mértola", "Moura", "Odemira", "Ourique", "Serpa", "Vidigueira",
+    # Braga
+    "Amares", "Barcelos", "Braga", "Cabeceiras de Basto", "Celorico de Basto", "Esposende", "Fafe",
+    "Guimarães", "Póvoa de Lanhoso", "Terras de Bouro", "Vieira do Minho", "Vila Nova de Famalicão",
+    "Vila Verde", "Vizela",
+    # Bragança
+    "Alfândega da Fé", "Bragança", "Carrazeda de Ansiães", "Freixo de Espada à Cinta",
+    "Macedo de Cavaleiros", "Miranda do Douro", "Mirandela", "Mogadouro", "Torre de Moncorvo",
+    "Vila Flor", "Vimioso", "Vinhais",
+    # Castelo Branco
+    "Belmonte", "Castelo Branco", "Covilhã", "Fundão", "Idanha-a-Nova", "Oleiros", "Penamacor",
+    "Proença-a-Nova", "Sertã", "Vila de Rei", "Vila Velha de Ródão",
+    # Coimbra
+    "Arganil", "Cantanhede", "Coimbra", "Condeixa-a-Nova", "Figueira da Foz", "Góis", "Lousã", "Mira",
+    "Miranda do Corvo", "Montemor-o-Velho", "Oliveira do Hospital", "Pampilhosa da Serra", "Penacova",
+    "Penela", "Soure", "Tábua", "Vila Nova de Poiares",
+    # Évora
+    "Alandroal", "Arraiolos", "Borba", "Estremoz", "Évora", "Montemor-o-Novo", "Mora", "Mourão",
+    "Portel", "Redondo", "Reguengos de Monsaraz", "Vendas Novas", "Viana do Alentejo", "Vila Viçosa",
+    # Faro
+    "Albufeira", "Alcoutim", "Aljezur", "Castro Marim", "Faro", "Lagoa", "Lagos", "Loulé", "Monchique",
+    "Olhão", "Portimão", "São Brás de Alportel", "Silves", "Tavira", "Vila do Bispo",
+    "Vila Real de Santo António",
+    # Guarda
+    "Aguiar da Beira", "Almeida", "Celorico da Beira", "Figueira de Castelo Rodrigo",
+    "Fornos de Algodres", "Gouveia", "Guarda", "Manteigas", "Mêda", "Pinhel", "Sabugal", "Seia",
+    "Trancoso", "Vila Nova de Foz Côa",
+    # Leiria
+    "Alcobaça", "Alvaiázere", "Ansião", "Batalha", "Bombarral", "Caldas da Rainha",
+    "Castanheira de Pera", "Figueiró dos Vinhos", "Leiria", "Marinha Grande", "Nazaré", "Óbidos",
+    "Pedrógão Grande", "Peniche", "Pombal", "Porto de Mós",
+    # Lisboa
+    "Alenquer", "Amadora", "Arruda dos Vinhos", "Azambuja", "Cadaval", "Cascais", "Lisboa", "Loures",
+    "Lourinhã", "Mafra", "Odivelas", "Oeiras", "Sintra", "Sobral de Monte Agraço", "Torres Vedras",
+    "Vila Franca de Xira",
+    # Portalegre
+    "Alter do Chão", "Arronches", "Avis", "Campo Maior", "Castelo de Vide", "Crato", "Elvas",
+    "Fronteira", "Gavião", "Marvão", "Monforte", "Nisa", "Ponte de Sor", "Portalegre", "Sousel",
+    # Porto
+    "Amarante", "Baião", "Felgueiras", "Gondomar", "Lousada", "Maia", "Marco de Canaveses",
+    "Matosinhos", "Paços de Ferreira", "Paredes", "Penafiel", "Porto", "Póvoa de Varzim",
+    "Santo Tirso", "Trofa", "Valongo", "Vila do Conde", "Vila Nova de Gaia",
+    # Santarém
+    "Abrantes", "Alcanena", "Almeirim", "Alpiarça", "Benavente", "Cartaxo", "Chamusca", "Constância",
+    "Coruche", "Entroncamento", "Ferreira do Zêzere", "Golegã", "Mação", "Ourém", "Rio Maior",
+    "Salvaterra de Magos", "Santarém", "Sardoal", "Tomar", "Torres Novas", "Vila Nova da Barquinha",
+    # Setúbal
+    "Alcácer do Sal", "Alcochete", "Almada", "Barreiro", "Grândola", "Moita", "Montijo", "Palmela",
+    "Santiago do Cacém", "Seixal", "Sesimbra", "Setúbal", "Sines",
+    # Viana do Castelo
+    "Arcos de Valdevez", "Caminha", "Melgaço", "Monção", "Paredes de Coura", "Ponte da Barca",
+    "Ponte de Lima", "Valença", "Viana do Castelo", "Vila Nova de Cerveira",
+    # Vila Real
+    "Alijó", "Boticas", "Chaves", "Mesão Frio", "Mondim de Basto", "Montalegre", "Murça",
+    "Peso da Régua", "Ribeira de Pena", "Sabrosa", "Santa Marta de Penaguião", "Valpaços",
+    "Vila Pouca de Aguiar", "Vila Real",
+    # Viseu
+    "Armamar", "Carregal do Sal", "Castro Daire", "Cinfães", "Lamego", "Mangualde",
+    "Moimenta da Beira", "Mortágua", "Nelas", "Oliveira de Frades", "Penalva do Castelo", "Penedono",
+    "Resende", "Santa Comba Dão", "São João da Pesqueira", "São Pedro do Sul", "Sátão", "Sernancelhe",
+    "Tabuaço", "Tarouca", "Tondela", "Vila Nova de Paiva", "Viseu", "Vouzela",
+    # Madeira
+    "Calheta", "Câmara de Lobos", "Funchal", "Machico", "Ponta do Sol", "Porto Moniz", "Porto Santo",
+    "Ribeira Brava", "Santa Cruz", "Santana", "São Vicente",
+    # Açores (Calheta e Lagoa repetem nomes de cima)
+    "Angra do Heroísmo", "Corvo", "Horta", "Lajes das Flores", "Lajes do Pico", "Madalena",
+    "Nordeste", "Ponta Delgada", "Povoação", "Ribeira Grande", "Santa Cruz da Graciosa",
+    "Santa Cruz das Flores", "São Roque do Pico", "Velas", "Vila da Praia da Vitória", "Vila do Porto",
+    "Vila Franca do Campo",
+)
+
+# Ilhas: nome -> aliases. Nomes que são palavras comuns ("terceira", "flores", "pico")
+# só contam com o prefixo "Ilha ...".
+ISLANDS = {
+    "Madeira": ("Ilha da Madeira",),
+    "Porto Santo": ("Ilha de Porto Santo",),
+    "São Miguel": ("São Miguel", "Ilha de São Miguel"),
+    "Santa Maria": ("Ilha de Santa Maria",),
+    "Terceira": ("Ilha Terceira",),
+    "Graciosa": ("Ilha Graciosa",),
+    "São Jorge": ("São Jorge", "Ilha de São Jorge"),
+    "Pico": ("Ilha do Pico",),
+    "Faial": ("Faial", "Ilha do Faial"),
+    "Flores": ("Ilha das Flores",),
+    "Corvo": ("Ilha do Corvo",),
+}
+
+# Regiões que aparecem sozinhas nos nomes das provas ("Open Madeira", "Circuito Açores")
+REGIONS = {
+    "Madeira": ("Madeira",),
+    "Açores": ("Açores", "Azores"),
+    "Algarve": ("Algarve",),
+    "Alentejo": ("Alentejo",),
+    "Minho": ("Minho",),
+}
+
+# Localidades (não-concelhos) onde há clubes/provas com frequência
+LOCALITIES = (
+    "Ericeira", "Estoril", "Carcavelos", "Parede", "Costa da Caparica", "Vilamoura", "Quarteira",
+    "Armação de Pêra", "Praia da Rocha", "Alvor", "Quinta do Lago", "Vale do Lobo", "Foz do Douro",
+    "Leça da Palmeira", "Valadares", "Miramar", "Aroeira",
+)
+
+# Nomes que também são palavras comuns ou apelidos ("Taça Batalha de Campeões", "Memorial
+# Almeida", "Open Corvo"): só contam como local se forem o texto todo ("Tomar") ou vierem
+# depois de um prefixo de concelho ("Câmara Municipal de Tomar", "Município da Horta").
+AMBIGUOUS_NAMES = frozenset({
+    "Abrantes", "Almeida", "Alvito", "Alvor", "Angra", "Aroeira", "Barrancos", "Batalha", "Belmonte",
+    "Borba", "Calheta", "Caminha", "Chaves", "Corvo", "Cuba", "Elvas", "Fronteira", "Gavião",
+    "Gouveia", "Guarda", "Horta", "Lagoa", "Madalena", "Mira", "Miramar", "Monforte", "Mora",
+    "Moura", "Nazaré", "Nordeste", "Oleiros", "Parede", "Paredes", "Pombal", "Povoação", "Redondo",
+    "Régua", "Resende", "Sabrosa", "Santa Cruz", "Santana", "Serpa", "Tábua", "Tomar", "Vagos",
+    "Valadares", "Velas",
+})
+
+CONTEXT_PREFIXES = tuple(
+    f"{head} {prep}"
+    for head in ("Concelho", "Município", "Câmara Municipal", "CM")
+    for prep in ("de", "da", "do")
+)
+
+# Grafias alternativas de concelhos
+ALIASES = {
+    "Lisboa": ("Lisbon",),
+    "Porto": ("Oporto",),
+    "Vila Nova de Gaia": ("Gaia",),
+    "Vila Nova de Famalicão": ("Famalicão",),
+    "Vila Real de Santo António": ("VRSA",),
+    "Angra do Heroísmo": ("Angra",),
+    "Peso da Régua": ("Régua",),
+    "Vila da Praia da Vitória": ("Praia da Vitória",),
+}
+
+# Termos típicos de nomes de clubes/organizações
+CLUB_TERMS = (
+    "CP", "CT", "Clube", "Padel", "Padel Club", "Padel Clube", "Associação", "Academia",
+    "Racket Club", "Country Club", "Ténis",
+)
+
+PLACE_KINDS = frozenset({"municipality", "island", "region", "locality"})
+
+
+# =================================================
+# AUTÓMATO (Aho-Corasick)
+# =================================================
+
+def fold(text) -> str:
+    """Minúsculas, sem acentos, espaços colapsados ("  Évora " -> "evora")."""
+    s = unicodedata.normalize("NFKD", "" if text is None else str(text))
+    s = "".join(ch for ch in s if not unicodedata.combining(ch))
+    return " ".join(s.lower().split())
+
+
+class GazetteerMatch(NamedTuple):
+    start: int
+    end: int
+    name: str
+    kind: str
+
+
+class _Automaton:
+    """Trie com ligações de falha; os padrões são (alias dobrado, nome, tipo, só texto inteiro)."""
+
+    __slots__ = ("goto", "fail", "out", "patterns")
+
+    def __init__(self, patterns: list[tuple[str, str, str, bool]]):
+        self.patterns = patterns
+        self.goto: list[dict[str, int]] = [{}]
+        self.out: list[list[int]] = [[]]
+
+        for pid, (alias, _, _, _) in enumerate(patterns):
+            state = 0
+            for ch in alias:
+                nxt = self.goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][ch] = nxt
+                    self.goto.append({})
+                    self.out.append([])
+                state = nxt
+            self.out[state].append(pid)
+
+        self.fail = [0] * len(self.goto)
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def iter_matches(self, folded: str):
+        """Ocorrências em palavras inteiras num texto já dobrado (uma passagem).
+
+        Padrões "só texto inteiro" (nomes ambíguos) só contam se ocuparem o texto todo.
+        """
+        goto, fail, out, patterns = self.goto, self.fail, self.out, self.patterns
+        n = len(folded)
+        state = 0
+        for i, ch in enumerate(folded):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for pid in out[state]:
+                alias, name, kind, whole = patterns[pid]
+                start, end = i + 1 - len(alias), i + 1
+                if whole:
+                    if start == 0 and end == n:
+                        yield GazetteerMatch(start, end, name, kind)
+                elif (start == 0 or not folded[start - 1].isalnum()) and (end == n or not folded[end].isalnum()):
+                    yield GazetteerMatch(start, end, name, kind)
+
+
+def _patterns() -> list[tuple[str, str, str, bool]]:
+    entries: list[tuple[str, str, str]] = []
+    for name in MUNICIPALITIES:
+        entries.append((name, name, "municipality"))
+    for name, aliases in ALIASES.items():
+        entries.extend((a, name, "municipality") for a in aliases)
+    for name, aliases in ISLANDS.items():
+        entries.extend((a, name, "island") for a in aliases)
+    for name, aliases in REGIONS.items():
+        entries.extend((a, name, "region") for a in aliases)
+    for name in LOCALITIES:
+        entries.append((name, name, "locality"))
+    for term in CLUB_TERMS:
+        entries.append((term, term, "club"))
+
+    patterns = {}
+    for alias, name, kind in entries:
+        if alias in AMBIGUOUS_NAMES:
+            candidates = [(alias, True)] + [(f"{prefix} {alias}", False) for prefix in CONTEXT_PREFIXES]
+        else:
+            candidates = [(alias, False)]
+        for text, whole in candidates:
+            # "Idanha-a-Nova" também aparece como "Idanha a Nova"
+            for variant in (fold(text), fold(text.replace("-", " "))):
+                patterns.setdefault((variant, kind), (variant, name, kind, whole))
+    return list(patterns.values())
+
+
+@lru_cache(maxsize=1)
+def get_matcher() -> _Automaton:
+    """Compilado uma vez por processo."""
+    return _Automaton(_patterns())
+
+
+# =================================================
+# API
+# =================================================
+
+@lru_cache(maxsize=65536)
+def find_place(text: str) -> str:
+    """Primeiro local (mais à esquerda, depois o mais comprido) no texto; "" se não houver."""
+    best = None
+    for m in get_matcher().iter_matches(fold(text)):
+        if m.kind in PLACE_KINDS and (best is None or (m.start, -m.end) < (best.start, -best.end)):
+            best = m
+    return best.name if best else ""
+
+
+@lru_cache(maxsize=65536)
+def match_kinds(text: str) -> frozenset[str]:
+    """Tipos de entradas encontrados no texto (ex.: {"municipality", "club"})."""
+    return frozenset(m.kind for m in get_matcher().iter_matches(fold(text)))
@@ -0,0 +1,52 @@
+import os
+import sys
+
+import pytest
+
+# os testes importam "modules.*" a partir da raiz do repositório
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _pdf_stream(data: bytes, attrs: str = "") -> bytes:
+    return b"<< " + attrs.encode("latin-1") + b" /Length %d >>\nstream\n" % len(data) + data + b"\nendstream"
+
+
+def build_pdf(pages: list[dict]) -> bytes:
+    """PDF mínimo escrito à mão: cada página é {"content": bytes, "form": bytes|None}.
+
+    O texto da página vem de "content"; se houver "form", a página desenha-o como Form
+    XObject (/X1 Do). Todas as páginas usam Helvetica como /F1.
+    """
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in pages:
+        content = page["content"]
+        xobjects = ""
+        if page.get("form") is not None:
+            objects.append(_pdf_stream(page["form"], "/Type /XObject /Subtype /Form /BBox [0 0 612 792] /Resources << /Font << /F1 3 0 R >> >>"))
+            xobjects = f" /XObject << /X1 {len(objects)} 0 R >>"
+            content += b"\nq /X1 Do Q"
+        objects.append(_pdf_stream(content))
+        contents_id = len(objects)
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {contents_id} 0 R "
+            f"/Resources << /Font << /F1 3 0 R >>{xobjects} >> >>".encode("latin-1")
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>".encode("latin-1")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % i + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % o for o in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+@pytest.fixture
+def make_pdf():
+    return build_pdf
@@ -0,0 +1,48 @@
+"""CalendarColumns é a única etapa de dedupe: chave normalizada (texto + datas)."""
+import datetime as dt
+
+from modules.calendar_pdf import CalendarColumns
+
+
+def _fields(**kw):
+    base = {
+        "Dia": "3-5", "DIV": "ABS", "Actividade": "Open Lisboa", "Categorias": "F1 F2",
+        "Classe": "1.000", "Local_pdf": "Lisboa", "Organizacao_pdf": "CP Lisboa",
+    }
+    base.update(kw)
+    return base
+
+
+def _append(cols, start_day, end_day, **kw):
+    cols.append(4, _fields(**kw), dt.date(2025, 4, start_day), dt.date(2025, 4, end_day))
+
+
+def test_repeats_differing_in_case_spacing_or_day_spelling_are_dropped():
+    cols = CalendarColumns()
+    _append(cols, 3, 5)
+    _append(cols, 3, 5, Actividade="  OPEN   lisboa ")
+    _append(cols, 3, 5, Dia="3 a 5")
+    _append(cols, 3, 5, Organizacao_pdf="CP  Lisboa")
+
+    assert len(cols) == 1
+    assert cols.actividade == ["Open Lisboa"]  # fica a primeira, pela ordem do PDF
+
+
+def test_distinct_rows_are_kept():
+    cols = CalendarColumns()
+    _append(cols, 3, 5)
+    _append(cols, 3, 6)
+    _append(cols, 3, 5, DIV="JOV")
+    _append(cols, 3, 5, Classe="2.500")
+    _append(cols, 3, 5, Local_pdf="Porto")
+
+    assert len(cols) == 5
+
+
+def test_shared_seen_dedupes_across_accumulators():
+    seen = set()
+    first, second = CalendarColumns(seen), CalendarColumns(seen)
+    _append(first, 3, 5)
+    _append(second, 3, 5, Actividade="open lisboa")
+
+    assert (len(first), len(second)) == (1, 0)
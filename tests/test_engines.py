@@ -0,0 +1,49 @@
+"""Os motores "tokens" e "bands" têm de dar os mesmos campos de texto nas linhas da tabela."""
+import pytest
+
+from modules.calendar_pdf import classify_page_words
+
+# x0 de cada coluna do cabeçalho (como no template do calendário)
+COLUMNS = [
+    ("MÊS", 28), ("DIA", 70), ("TIPO", 98), ("DIV", 128), ("ACTIVIDADES", 160),
+    ("CATEGORIAS", 330), ("CLASSE", 430), ("LOCAL", 480), ("ORGANIZAÇÃO", 590),
+]
+X = dict(COLUMNS)
+
+ROWS = [
+    # (dia, tipo, div, actividade, categorias, classe, local, organização)
+    ("3-5", "FPP", "ABS", "Open Lisboa FPP", "F1 F2", "1.000", "Lisboa", "CP Lisboa"),
+    ("9-10", "CIR", "JOV", "Circuito Jovem Norte", "S14 S16", "500", "Porto", "Padel Clube"),
+    ("12", "FPP", "ABS", "Taça Regional FPP", "M & F", "2.500", "Faro", "Racket Club Sul"),
+]
+
+
+def _words(texts: str, x: float, top: float) -> list[dict]:
+    out = []
+    for t in texts.split():
+        out.append({"text": t, "x0": x, "x1": x + 4 * len(t), "top": top, "bottom": top + 7})
+        x += 4 * len(t) + 3
+    return out
+
+
+def _page_words() -> list[dict]:
+    words = [w for name, x in COLUMNS for w in _words(name, x, 60)]
+    words += _words("MARÇO", X["MÊS"], 76)
+    for i, row in enumerate(ROWS):
+        top = 90 + 14 * i
+        for name, text in zip(["DIA", "TIPO", "DIV", "ACTIVIDADES", "CATEGORIAS", "CLASSE", "LOCAL", "ORGANIZAÇÃO"], row):
+            words += _words(text, X[name], top)
+    return words
+
+
+@pytest.mark.parametrize("field", ["Dia", "DIV", "Actividade", "Local_pdf", "Organizacao_pdf"])
+def test_engines_agree(field):
+    tokens = [v[field] for kind, v in classify_page_words(_page_words(), engine="tokens") if kind == "row"]
+    bands = [v[field] for kind, v in classify_page_words(_page_words(), engine="bands") if kind == "row"]
+    assert tokens == bands
+    assert len(tokens) == len(ROWS)
+
+
+def test_trailing_fpp_is_not_part_of_actividade():
+    rows = [v for kind, v in classify_page_words(_page_words(), engine="bands") if kind == "row"]
+    assert [r["Actividade"] for r in rows] == ["Open Lisboa", "Circuito Jovem Norte", "Taça Regional"]
@@ -0,0 +1,32 @@
+"""Nomes de concelhos que são palavras comuns/apelidos não podem ganhar a um local claro."""
+import pytest
+
+from modules.gazetteer import find_place, match_kinds
+
+
+@pytest.mark.parametrize(
+    "text, place",
+    [
+        ("Torneio Fronteira Norte Lisboa", "Lisboa"),
+        ("Taça Batalha de Campeões Porto", "Porto"),
+        ("Memorial Almeida Lisboa", "Lisboa"),
+        ("Open Corvo Cascais", "Cascais"),
+        ("Tomar Padel Open", ""),
+        # sozinhos, ou com prefixo de concelho, continuam a ser locais
+        ("Tomar", "Tomar"),
+        ("Câmara Municipal da Batalha", "Batalha"),
+        ("Torneio Município da Horta", "Horta"),
+        ("Open Ilha do Corvo", "Corvo"),
+        # o resto do gazetteer não muda
+        ("FIP Bronze Portimao FPP", "Portimão"),
+        ("Open Santa Cruz da Graciosa", "Santa Cruz da Graciosa"),
+        ("Circuito Peso da Régua", "Peso da Régua"),
+    ],
+)
+def test_find_place(text, place):
+    assert find_place(text) == place
+
+
+def test_ambiguous_name_inside_text_is_not_a_place():
+    assert "municipality" not in match_kinds("Taça Redondo Padel Clube")
+    assert "municipality" in match_kinds("Redondo")
@@ -0,0 +1,68 @@
+"""group_words_into_rows (sweep-line) tem de dar exactamente as linhas do loop antigo."""
+import os
+import json
+import random
+
+import pytest
+
+from modules.calendar_pdf import group_words_into_rows
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def group_words_into_rows_reference(words, y_tol=3):
+    """Loop original: cada palavra é comparada com todas as linhas já criadas."""
+    rows = []
+    for w in sorted(words, key=lambda x: (x["top"], x["x0"])):
+        placed = False
+        for r in rows:
+            if abs(w["top"] - r["y"]) <= y_tol:
+                r["words"].append(w)
+                r["y"] = (r["y"] * (len(r["words"]) - 1) + w["top"]) / len(r["words"])
+                placed = True
+                break
+        if not placed:
+            rows.append({"y": w["top"], "words": [w]})
+    for r in rows:
+        r["words"] = sorted(r["words"], key=lambda x: x["x0"])
+    return rows
+
+
+def _as_lines(rows):
+    return [(r["y"], [(w["text"], w["x0"], w["top"]) for w in r["words"]]) for r in rows]
+
+
+def _load_words(name):
+    with open(os.path.join(FIXTURES, name), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_synthetic_calendar_page_matches_reference():
+    """Palavras geradas no formato do extract_words e na grelha de colunas do calendário
+    (título, cabeçalho, meses, células com jitter e células em duas linhas); não é um
+    dump de um PDF publicado."""
+    words = _load_words("synthetic_calendar_page_words.json")
+    rows = group_words_into_rows([dict(w) for w in words])
+
+    assert _as_lines(rows) == _as_lines(group_words_into_rows_reference([dict(w) for w in words]))
+    header = " ".join(w["text"] for w in rows[1]["words"])
+    assert header.startswith("MÊS DIA TIPO DIV ACTIVIDADES")
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_random_words_match_reference(seed):
+    rng = random.Random(seed)
+    y_tol = rng.choice([0.5, 1, 2, 3, 5])
+    words = []
+    for i in range(rng.randint(0, 400)):
+        if rng.random() < 0.7:
+            # linhas "reais": topo de uma grelha com jitter
+            top = rng.randint(0, 60) * rng.choice([4, 7, 12]) + rng.uniform(-1.5, 1.5)
+        else:
+            # palavras soltas / cadeias que fazem a média da linha andar
+            top = rng.uniform(0, 800)
+        words.append({"text": f"w{i}", "x0": round(rng.uniform(0, 600), 1), "top": round(top, 2)})
+
+    got = group_words_into_rows([dict(w) for w in words], y_tol=y_tol)
+    want = group_words_into_rows_reference([dict(w) for w in words], y_tol=y_tol)
+    assert _as_lines(got) == _as_lines(want)
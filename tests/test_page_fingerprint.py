@@ -0,0 +1,37 @@
+"""page_fingerprint tem de mudar quando muda qualquer texto que a página desenha."""
+import pdfplumber
+from io import BytesIO
+
+from modules import calendar_cache
+from modules.calendar_pdf import page_fingerprint, parse_calendar_columns
+
+MONTH = b"BT /F1 10 Tf 40 740 Td (ABRIL) Tj ET"
+
+
+def _row(name: bytes) -> bytes:
+    return b"BT /F1 10 Tf 40 700 Td (3-5 FPP ABS Open " + name + b" F1 1.000) Tj ET"
+
+
+def _fingerprints(pdf_bytes: bytes) -> list:
+    with pdfplumber.open(BytesIO(pdf_bytes)) as pdf:
+        return [page_fingerprint(p) for p in pdf.pages]
+
+
+def test_same_page_same_fingerprint(make_pdf):
+    pdf = make_pdf([{"content": MONTH, "form": _row(b"Lisboa")}])
+    assert _fingerprints(pdf) == _fingerprints(pdf)
+    assert _fingerprints(pdf)[0] is not None
+
+
+def test_text_inside_form_xobject_changes_fingerprint(make_pdf):
+    a = make_pdf([{"content": MONTH, "form": _row(b"Lisboa")}])
+    b = make_pdf([{"content": MONTH, "form": _row(b"Porto")}])
+    assert _fingerprints(a) != _fingerprints(b)
+
+
+def test_page_cache_does_not_reuse_other_revision(make_pdf, tmp_path, monkeypatch):
+    monkeypatch.setattr(calendar_cache, "CACHE_DIR", str(tmp_path))
+    for name in (b"Lisboa", b"Porto"):
+        pdf = make_pdf([{"content": MONTH, "form": _row(name)}])
+        cols = parse_calendar_columns(pdf, 2025, workers=1, mode="page", engine="tokens")
+        assert cols.actividade == ["Open " + name.decode()]
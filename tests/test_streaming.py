@@ -0,0 +1,27 @@
+"""iter_calendar_frames(into=...) tem de acumular exactamente o parse_calendar_columns."""
+import pandas as pd
+
+from modules.calendar_pdf import CalendarColumns, iter_calendar_frames, parse_calendar_columns
+
+
+def _line(y: int, text: bytes) -> bytes:
+    return b"BT /F1 8 Tf 40 %d Td (" % y + text + b") Tj ET\n"
+
+
+def test_streamed_accumulator_matches_full_parse(make_pdf):
+    pdf = make_pdf(
+        [
+            {"content": _line(740, b"ABRIL") + _line(720, b"9-10 FPP JOV Open Porto F1 500")
+             + _line(700, b"3-5 FPP ABS Open Lisboa F1 1.000")},
+            # repete uma linha da página anterior e continua em Abril
+            {"content": _line(740, b"3-5 FPP ABS Open Lisboa F1 1.000") + _line(720, b"12 FPP ABS Open Faro M1 250")},
+            {"content": _line(740, b"MAIO") + _line(720, b"1-3 FPP ABS Open Braga F2 1.000")},
+        ]
+    )
+    cols = CalendarColumns()
+    frames = list(iter_calendar_frames(pdf, 2025, into=cols, workers=1, use_page_cache=False, mode="page"))
+
+    assert [len(f) for f in frames] == [2, 1, 1]
+    full = parse_calendar_columns(pdf, 2025, workers=1, use_page_cache=False, mode="page").to_frame()
+    pd.testing.assert_frame_equal(cols.to_frame(), full)
+    assert full["Actividade"].tolist() == ["Open Lisboa", "Open Porto", "Open Faro", "Open Braga"]
@@ -0,0 +1,23 @@
+"""O modo "table" tem de dar as mesmas linhas que o modo "page"."""
+import pytest
+
+from modules.calendar_pdf import parse_calendar_columns
+
+HEADER = b"BT /F1 8 Tf 40 760 Td (MES DIA TIPO DIV ACTIVIDADES) Tj 360 0 Td (LOCAL ORGANIZACAO) Tj ET"
+
+
+def _row(name: bytes) -> bytes:
+    return b"BT /F1 8 Tf 40 700 Td (3-5 FPP ABS " + name + b" F1 1.000) Tj ET"
+
+
+@pytest.mark.parametrize("mode", ["page", "table"])
+def test_text_drawn_by_form_xobject_is_kept(make_pdf, mode):
+    pdf = make_pdf(
+        [
+            {"content": HEADER + b"\nBT /F1 8 Tf 40 730 Td (ABRIL) Tj ET\n" + _row(b"Pagina Um")},
+            # segunda página: a linha da tabela só existe dentro de um Form XObject
+            {"content": HEADER, "form": _row(b"Pagina Dois")},
+        ]
+    )
+    cols = parse_calendar_columns(pdf, 2025, workers=1, use_page_cache=False, mode=mode, engine="tokens")
+    assert cols.actividade == ["Pagina Um", "Pagina Dois"]
@@ -0,0 +1,35 @@
+"""FPPADEL_VIEW_CACHE_SIZE inválido não pode rebentar o import; <= 0 desliga a cache."""
+import numpy as np
+import pytest
+
+from modules.calendar_index import ViewCache, _view_cache_size
+
+
+@pytest.mark.parametrize(
+    "value, size",
+    [(None, 256), ("", 256), ("64", 64), (" 32 ", 32), ("two", 256), ("4x", 256), ("0", 0), ("-5", -5)],
+)
+def test_view_cache_size_from_env(value, size):
+    assert _view_cache_size(value) == size
+
+
+@pytest.mark.parametrize("maxsize", [0, -1])
+def test_non_positive_size_disables_the_cache(maxsize):
+    cache = ViewCache(maxsize=maxsize)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return np.arange(3)
+
+    assert cache.get_or_compute("k", compute).tolist() == [0, 1, 2]
+    assert cache.get_or_compute("k", compute).tolist() == [0, 1, 2]
+    assert len(calls) == 2
+    assert cache.stats()["size"] == 0
+
+
+def test_positive_size_caches():
+    cache = ViewCache(maxsize=1)
+    cache.get_or_compute("k", lambda: np.arange(3))
+    cache.get_or_compute("k", lambda: np.arange(3))
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 1)